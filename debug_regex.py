@@ -1,7 +1,10 @@
 import re
 import shlex
 
-pattern = re.compile(r'{{<\s*([\w-]+)\s*(.*?)\s*>}}(?:(.*?){{<\s*/\1\s*>}})?', re.DOTALL)
+# Mirrors generator.shortcode_manager._SHORTCODE_RE: the [^>] arg class
+# cannot cross the tag delimiter, avoiding catastrophic backtracking on
+# unbalanced {{< input.
+pattern = re.compile(r'{{<\s*([\w-]+)\s*([^>]*?)\s*>}}(?:([\s\S]*?){{<\s*/\1\s*>}})?')
 
 content = 'Du kan mejla mig på {{< email "alexander@klippel.se" >}}.'
 
@@ -3,24 +3,47 @@ import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# orjson is a C/SIMD JSON implementation; several times faster than stdlib
+# json for the large cache dicts we read/write every build.
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+
 class CacheManager:
     def __init__(self, cache_dir: str = '.cache', cache_file: str = 'markdown_cache.json'):
         self.cache_dir = Path(cache_dir)
         self.cache_file = self.cache_dir / cache_file
         self.cache: Dict[str, Any] = {}
+        # Second cache layer keyed by a hash of the file body, so identical
+        # content survives renames, touches and fresh git checkouts where
+        # the (path, mtime) key would miss.
+        self.html_by_hash: Dict[str, str] = {}
         self._load_cache()
 
     def _load_cache(self):
         """Load cache from disk."""
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
+                raw = self.cache_file.read_bytes()
+                if _json_fast:
+                    data = _json_fast.loads(raw)
+                else:
+                    data = json.loads(raw)
+
+                if 'entries' in data:
+                    self.cache = data.get('entries', {})
+                    self.html_by_hash = data.get('html_by_hash', {})
+                else:
+                    # Legacy format: flat {path: entry} dict
+                    self.cache = data
             except Exception as e:
                 print(f"Warning: Failed to load cache: {e}")
                 self.cache = {}
+                self.html_by_hash = {}
         else:
             self.cache = {}
+            self.html_by_hash = {}
 
     def get(self, file_path: str, mtime: float) -> Optional[Dict[str, Any]]:
         """
@@ -54,8 +77,20 @@ class CacheManager:
         if not self.cache_dir.exists():
             self.cache_dir.mkdir(parents=True, exist_ok=True)
             
+        payload = {
+            'entries': self.cache,
+            'html_by_hash': self.html_by_hash
+        }
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2)
+            if _json_fast:
+                data = _json_fast.dumps(payload)
+            else:
+                data = json.dumps(payload).encode('utf-8')
+            # Write via tempfile + os.replace: one buffered write syscall
+            # and an atomic swap, so an interrupted build can't leave a
+            # truncated cache behind.
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.cache_file)
         except Exception as e:
             print(f"Warning: Failed to save cache: {e}")
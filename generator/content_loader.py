@@ -1,18 +1,171 @@
+import hashlib
 import os
+import re
+import sys
 import markdown
+import yaml
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse
 from pathlib import Path
 from datetime import datetime, date
 
 from typing import List, Dict, Any, Optional
-from dateutil import parser as date_parser
-from typing import List, Dict, Any, Optional
-from dateutil import parser as date_parser
 from .models import ContentItem, MicroPost, BlogPost, Review, Bookmark, CONTENT_TYPES
 from .shortcode_manager import ShortcodeManager
 from .cache import CacheManager
-import frontmatter as fm
 
+# Use the libyaml C loader when available (much faster than pure Python)
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
+# Frontmatter fence: ---\n<yaml>\n---\n<body>. Splitting the raw bytes
+# ourselves avoids python-frontmatter's second file open and its
+# pure-Python SafeLoader pass, and hands us the body bytes for hashing.
+_FM_RE = re.compile(rb'\A---\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n(.*))?\Z', re.DOTALL)
+
+
+# Below this many files the process-pool startup cost outweighs the
+# parallel parsing win, so we parse serially.
+_MIN_PARALLEL_FILES = 16
+
+# Markdown extension pipeline; folded into the content-hash cache key so
+# changing the pipeline invalidates hashed entries.
+_MD_EXTENSIONS = ['fenced_code', 'tables', 'codehilite', 'extra']
+
+# Frontmatter date types serialized for the cache
+_DT_TYPES = (datetime, date)
+
+
+def _pygments_highlight(code, lang, attrs):
+    """Fence highlighter for markdown-it, matching codehilite's markup."""
+    if lang:
+        try:
+            from pygments import highlight
+            from pygments.lexers import get_lexer_by_name
+            from pygments.formatters import HtmlFormatter
+            return highlight(code, get_lexer_by_name(lang),
+                             HtmlFormatter(cssclass='codehilite'))
+        except Exception:
+            pass
+    return ''  # empty string lets markdown-it fall back to escaped <pre>
+
+
+def _build_markdown_renderer():
+    """
+    Pick the fastest available markdown engine.
+
+    Chain, fastest first: markdown-it-py, then mistune, then the
+    reference Python-Markdown package (SAMLA_MARKDOWN=legacy forces it,
+    e.g. for content that relies on its 'extra' behaviours). The
+    C-backed cmarkgfm is available as an explicit opt-in
+    (SAMLA_MARKDOWN=cmarkgfm) because it renders fenced code without
+    Pygments, so highlighted blocks lose their codehilite markup.
+    Returns (engine_name, render_callable); the engine name is folded
+    into the content-hash cache key so switching engines invalidates
+    cached HTML.
+    """
+    choice = os.environ.get('SAMLA_MARKDOWN')
+
+    if choice == 'cmarkgfm':
+        try:
+            import cmarkgfm
+            from cmarkgfm.cmark import Options as _CmarkOptions
+            # Shortcodes expand to raw HTML before the markdown pass, so
+            # the parser must let it through
+            opts = _CmarkOptions.CMARK_OPT_UNSAFE
+            return 'cmarkgfm', lambda text: cmarkgfm.github_flavored_markdown_to_html(text, options=opts)
+        except ImportError:
+            print("Warning: SAMLA_MARKDOWN=cmarkgfm but cmarkgfm is not installed.")
+
+    if choice != 'legacy':
+        if choice != 'mistune':
+            try:
+                from markdown_it import MarkdownIt
+                md = MarkdownIt('commonmark', {
+                    'html': True,
+                    'highlight': _pygments_highlight
+                }).enable(['table', 'strikethrough'])
+                return 'markdown-it', md.render
+            except ImportError:
+                pass
+
+        try:
+            import mistune
+
+            class _HighlightRenderer(mistune.HTMLRenderer):
+                def block_code(self, code, info=None):
+                    if info:
+                        highlighted = _pygments_highlight(code, info.split()[0], '')
+                        if highlighted:
+                            return highlighted
+                    return super().block_code(code, info)
+
+            md = mistune.create_markdown(
+                renderer=_HighlightRenderer(escape=False),
+                plugins=['table', 'strikethrough']
+            )
+            return 'mistune', md
+        except ImportError:
+            pass
+
+    # Build the extension pipeline (parser tree, codehilite's Pygments
+    # registry) once; reset() only clears per-document state like
+    # footnotes. Not thread-safe, which is fine: each loader/worker
+    # process owns its instance and converts files serially.
+    md = markdown.Markdown(extensions=_MD_EXTENSIONS, output_format='html5')
+    return 'python-markdown', lambda text: md.reset().convert(text)
+
+# Compiled templates for Jinja embedded in markdown, keyed by environment
+# identity plus a short digest of the source. Repeated boilerplate across
+# posts (and watch-mode rebuilds) compiles once instead of per file.
+_TEMPLATE_CACHE: Dict[Any, Any] = {}
+
+
+def _compile_embedded(jinja_env, source: str):
+    key = (id(jinja_env),
+           hashlib.blake2b(source.encode('utf-8'), digest_size=8).digest())
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        template = jinja_env.from_string(source)
+        _TEMPLATE_CACHE[key] = template
+    return template
+
+
+def _parse_chunk(payload):
+    """
+    Worker entry point for parallel parsing.
+
+    Jinja environments aren't picklable, so each worker rebuilds one from
+    the templates directory plus the (plain-data) globals captured in the
+    parent, then parses its chunk of files with a local ContentLoader.
+    Returns the parsed posts and the worker's cache dict for merging.
+    """
+    (content_dir, include_drafts, url_slugs, site_context, jinja_globals, tasks) = payload
+
+    jinja_env = None
+    if site_context is not None:
+        from .renderer import Renderer
+        renderer = Renderer('templates')
+        renderer.env.globals.update(jinja_globals)
+        jinja_env = renderer.env
+
+    loader = ContentLoader(
+        content_dir,
+        include_drafts=include_drafts,
+        jinja_env=jinja_env,
+        site_context=site_context,
+        url_slugs=url_slugs
+    )
+
+    posts = []
+    for file_path, section, slug, mtime in tasks:
+        post = loader._parse_post(Path(file_path), section, slug, mtime)
+        if post:
+            posts.append(post)
+
+    return posts, loader.cache_manager.cache, loader.cache_manager.html_by_hash
 
 
 class ContentLoader:
@@ -25,15 +178,20 @@ class ContentLoader:
     3. Rendering Jinja2 templates embedded in Markdown.
     4. Caching results to speed up subsequent builds.
     """
-    def __init__(self, content_dir: str, include_drafts: bool = False, jinja_env=None, site_context=None, url_slugs=None):
+    def __init__(self, content_dir: str, include_drafts: bool = False, jinja_env=None, site_context=None, url_slugs=None, shortcode_manager=None):
         self.content_dir = Path(content_dir)
         self.include_drafts = include_drafts
-        self.shortcode_manager = ShortcodeManager()
+        self.shortcode_manager = shortcode_manager or ShortcodeManager.shared()
         self.cache_manager = CacheManager()
         self.jinja_env = jinja_env
         self.site_context = site_context
         self.url_slugs = url_slugs or {}
 
+        # Built once per loader; the engine/pipeline signature keys the
+        # content-hash cache so cached HTML never crosses engines.
+        engine_name, self._render_markdown = _build_markdown_renderer()
+        self._md_sig = f"{engine_name}:{','.join(_MD_EXTENSIONS)}".encode('utf-8')
+
     def load_content(self) -> List[ContentItem]:
         """
         Traverses the content directory and loads all valid content items.
@@ -42,46 +200,111 @@ class ContentLoader:
             List[ContentItem]: A list of parsed content items, sorted by date (newest first).
         """
 
-        posts = []
         # Walk through top-level directories which are 'sections' or 'types'
         if not self.content_dir.exists():
             return []
 
-        for section in os.listdir(self.content_dir):
-            section_path = self.content_dir / section
-            if not section_path.is_dir():
-                continue
-            
-            # Now walk through slug directories OR files
-            for item in os.listdir(section_path):
-                item_path = section_path / item
-                
-                if item_path.is_dir():
-                    post_file = item_path / 'post.md'
-                    if post_file.exists():
-                        slug = item
-                        post = self._parse_post(post_file, section, slug)
-                        if post:
-                            posts.append(post)
-                            
-                elif item_path.is_file() and item.endswith('.md'):
-                    slug = item[:-3] # remove .md
-                    post = self._parse_post(item_path, section, slug)
-                    if post:
-                        posts.append(post)
-        
+        # Phase 1: collect (file_path, section, slug, mtime) tasks in a
+        # single os.walk pass. All file metadata is gathered here, so the
+        # parse phase never stats or probes the filesystem again.
+        # Layout: content/<section>/<file>.md or content/<section>/<slug>/post.md
+        tasks = []
+        for root, dirs, files in os.walk(self.content_dir):
+            rel_parts = Path(root).relative_to(self.content_dir).parts
+            depth = len(rel_parts)
+
+            if depth == 1:
+                section = rel_parts[0]
+                for name in files:
+                    if name.endswith('.md'):
+                        path = os.path.join(root, name)
+                        slug = name[:-3] # remove .md
+                        tasks.append((path, section, slug, os.stat(path).st_mtime))
+
+            elif depth == 2 and 'post.md' in files:
+                path = os.path.join(root, 'post.md')
+                tasks.append((path, rel_parts[0], rel_parts[1], os.stat(path).st_mtime))
+
+        # Pre-resolve network-backed shortcodes (soundcloud URL embeds) for
+        # files the mtime cache won't serve, so the renders below never
+        # block on a network round-trip. Only changed files are re-read.
+        pending_bodies = []
+        cache_hits = 0
+        for file_path, _, _, mtime in tasks:
+            if self.cache_manager.get(file_path, mtime) is None:
+                try:
+                    text = Path(file_path).read_bytes().decode('utf-8', 'ignore')
+                except OSError:
+                    continue
+                if '{{<' in text and 'soundcloud' in text:
+                    pending_bodies.append(text)
+            else:
+                cache_hits += 1
+        if pending_bodies:
+            self.shortcode_manager.prewarm(pending_bodies)
+
+        # Phase 2: parse. Each file is independent, so large corpora are
+        # split across CPU cores; small sites stay on the cheap serial path.
+        posts = None
+        if len(tasks) >= _MIN_PARALLEL_FILES:
+            try:
+                posts = self._parse_parallel(tasks)
+            except Exception as e:
+                print(f"Warning: Parallel parsing failed ({e}), falling back to serial.")
+
+        if posts is None:
+            posts = []
+            for file_path, section, slug, mtime in tasks:
+                post = self._parse_post(Path(file_path), section, slug, mtime)
+                if post:
+                    posts.append(post)
+
         # Sort by date, newest first
         posts.sort(key=lambda x: x.date, reverse=True)
-        
+
+        if tasks:
+            print(f"  ✔ markdown cache: {cache_hits}/{len(tasks)} files served from cache")
+
         # Save cache
         self.cache_manager.save()
-        
+
         return posts
 
+    def _parse_parallel(self, tasks) -> List[ContentItem]:
+        """Parse tasks across CPU cores with one chunk per worker."""
+        # Jinja2 environments can't cross process boundaries; ship only the
+        # plain-data globals (i18n strings, slugs) and rebuild in the worker.
+        jinja_globals = {}
+        site_context = None
+        if self.jinja_env is not None and self.site_context is not None:
+            site_context = self.site_context
+            for k, v in self.jinja_env.globals.items():
+                if isinstance(v, (str, int, float, bool, list, tuple, dict)):
+                    jinja_globals[k] = v
+
+        workers = min(os.cpu_count() or 1, len(tasks))
+        chunks = [tasks[i::workers] for i in range(workers)]
+        payloads = [
+            (str(self.content_dir), self.include_drafts, self.url_slugs,
+             site_context, jinja_globals, chunk)
+            for chunk in chunks if chunk
+        ]
+
+        posts = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_posts, chunk_cache, chunk_hashes in executor.map(_parse_chunk, payloads):
+                posts.extend(chunk_posts)
+                # Merge worker cache entries so the parent's save() persists them
+                self.cache_manager.cache.update(chunk_cache)
+                self.cache_manager.html_by_hash.update(chunk_hashes)
 
-    def _parse_post(self, file_path: Path, section: str, slug: str) -> Optional[ContentItem]:
+        return posts
+
+
+    def _parse_post(self, file_path: Path, section: str, slug: str, mtime: Optional[float] = None) -> Optional[ContentItem]:
         try:
-            mtime = file_path.stat().st_mtime
+            if mtime is None:
+                mtime = file_path.stat().st_mtime
             
             # Check cache with file modification time.
             # If the file hasn't changed since the last build, we return the cached HTML
@@ -92,32 +315,58 @@ class ContentLoader:
                 html_content = cached_data['html']
                 frontmatter = cached_data['frontmatter']
             else:
-                post_data = fm.load(file_path)
-                content_raw = post_data.content
-                frontmatter = post_data.metadata
-                
-                content_with_shortcodes = self.shortcode_manager.process(content_raw)
-                
-                if self.jinja_env and self.site_context:
-                    try:
-                        # Create a template from the content with shortcodes already expanded
-                        template = self.jinja_env.from_string(content_with_shortcodes)
-                        # Render it with the site context
-                        content_raw = template.render(**self.site_context)
-                    except Exception as e:
-                        print(f"Error rendering Liquid/Jinja in {file_path}: {e}")
-                        # Fallback to content with shortcodes if rendering fails
-                        content_raw = content_with_shortcodes
+                raw = file_path.read_bytes()
+                if raw.startswith(b'\xef\xbb\xbf'):
+                    raw = raw[3:]
+
+                fence = _FM_RE.match(raw)
+                if fence:
+                    frontmatter = yaml.load(fence.group(1), Loader=_YLoader)
+                    if not isinstance(frontmatter, dict):
+                        frontmatter = {}
+                    body = fence.group(2) or b''
+                else:
+                    frontmatter = {}
+                    body = raw
+                content_raw = body.decode('utf-8')
+
+                # Content-hash layer: identical bodies render to identical
+                # HTML regardless of path or mtime, so renames, touches and
+                # re-cloned trees still short-circuit the render pipeline.
+                body_hash = hashlib.sha256(body + self._md_sig).hexdigest()[:16]
+                cached_html = self.cache_manager.html_by_hash.get(body_hash)
+
+                if cached_html is not None:
+                    html_content = cached_html
                 else:
-                    content_raw = content_with_shortcodes
-                
-                html_content = markdown.markdown(content_raw, extensions=['fenced_code', 'tables', 'codehilite', 'extra'])
-                
-                # Prepare frontmatter for cache by serializing datetimes
+                    content_with_shortcodes = self.shortcode_manager.process(content_raw)
+
+                    if self.jinja_env and self.site_context:
+                        try:
+                            # Create a template from the content with shortcodes already expanded
+                            template = _compile_embedded(self.jinja_env, content_with_shortcodes)
+                            # Render it with the site context
+                            content_raw = template.render(**self.site_context)
+                        except Exception as e:
+                            print(f"Error rendering Liquid/Jinja in {file_path}: {e}")
+                            # Fallback to content with shortcodes if rendering fails
+                            content_raw = content_with_shortcodes
+                    else:
+                        content_raw = content_with_shortcodes
+
+                    html_content = self._render_markdown(content_raw)
+                    self.cache_manager.html_by_hash[body_hash] = html_content
+
+                # Prepare frontmatter for cache by serializing datetimes.
+                # Stored as epoch floats: reconstructing with
+                # datetime.fromtimestamp is far cheaper than re-parsing an
+                # ISO string through dateutil on every cache hit.
                 frontmatter_serializable = {}
                 for k, v in frontmatter.items():
-                    if isinstance(v, (datetime, date)):
-                        frontmatter_serializable[k] = v.isoformat()
+                    if isinstance(v, _DT_TYPES):
+                        if not isinstance(v, datetime):
+                            v = datetime.combine(v, datetime.min.time())
+                        frontmatter_serializable[k] = v.timestamp()
                     else:
                         frontmatter_serializable[k] = v
                         
@@ -134,11 +383,21 @@ class ContentLoader:
             
             # Date handling (Re-parse if coming from cache/string)
             date_val = frontmatter.get('date')
-            if isinstance(date_val, str):
+            if isinstance(date_val, (int, float)) and not isinstance(date_val, bool):
+                # Epoch float stored by the cache serializer above
+                date_obj = datetime.fromtimestamp(date_val)
+            elif isinstance(date_val, str):
+                # ISO 8601 is what we write ourselves; fromisoformat is a
+                # C builtin, so try it before falling back to dateutil's
+                # (slow, imported lazily) general-purpose parser.
                 try:
-                    date_obj = date_parser.parse(date_val)
-                except:
-                    date_obj = datetime.now()
+                    date_obj = datetime.fromisoformat(date_val)
+                except ValueError:
+                    try:
+                        from dateutil import parser as date_parser
+                        date_obj = date_parser.parse(date_val)
+                    except Exception:
+                        date_obj = datetime.now()
             elif isinstance(date_val, datetime):
                 # YAML loader might auto-parse dates
                 date_obj = date_val
@@ -162,10 +421,16 @@ class ContentLoader:
             else:
                 tags = tags_raw
             
-            # Normalize tags
-            tags = [str(t).lower() for t in tags]
-            
+            # Normalize tags. Sections, tags and categories are a small
+            # shared vocabulary repeated across thousands of items;
+            # interning dedupes the str objects and makes the dict/set
+            # operations in tag and category indexing cheap identity
+            # checks.
+            tags = [sys.intern(str(t).lower()) for t in tags]
+
             category = frontmatter.get('category')
+            if isinstance(category, str):
+                category = sys.intern(category)
             
             # Determine subclass and specific fields
             # Determine subclass
@@ -179,7 +444,7 @@ class ContentLoader:
                 'slug': slug,
                 'url': url,
                 'content': html_content,
-                'type': section,
+                'type': sys.intern(section),
                 'path': str(file_path),
                 'tags': tags,
                 'category': category
@@ -1,9 +1,22 @@
 import os
 import yaml
-import json
 from pathlib import Path
 from typing import Dict, Any
 
+# Use the libyaml C loader when available (much faster than pure Python)
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
+# Prefer orjson's C parser for .json data files
+try:
+    from orjson import loads as _jloads
+except ImportError:
+    from json import loads as _jloads
+
+_YAML_SUFFIXES = {'.yaml', '.yml'}
+
 class DataLoader:
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
@@ -25,12 +38,12 @@ class DataLoader:
                 content = None
                 
                 try:
-                    if item.suffix in ['.yaml', '.yml']:
+                    if item.suffix in _YAML_SUFFIXES:
                         with open(item, 'r', encoding='utf-8') as f:
-                            content = yaml.safe_load(f)
+                            content = yaml.load(f, Loader=_YLoader)
                     elif item.suffix == '.json':
-                        with open(item, 'r', encoding='utf-8') as f:
-                            content = json.load(f)
+                        with open(item, 'rb') as f:
+                            content = _jloads(f.read())
                     
                     if content is not None:
                         data[key] = content
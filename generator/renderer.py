@@ -1,14 +1,42 @@
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from bisect import bisect_right
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from pathlib import Path
 from typing import Any, Dict
 from datetime import datetime
 
+# Thresholds for relative_time: upper bound in seconds per unit. Looked up
+# via bisect instead of an if/elif cascade in the per-post render loop.
+_TIME_BOUNDS = (60, 3600, 86400, 604800, 2592000, 31536000)
+_TIME_UNITS = (
+    ('minute', 60),
+    ('hour', 3600),
+    ('day', 86400),
+    ('week', 604800),
+    ('month', 2592000),
+    ('year', 31536000),
+)
+
 class Renderer:
-    def __init__(self, templates_dir: str):
+    def __init__(self, templates_dir: str, auto_reload: bool = False):
+        # Persist compiled templates under .cache so rebuilds (and pool
+        # workers) load bytecode instead of recompiling every template.
+        cache_dir = Path('.cache/jinja')
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+        except OSError:
+            bytecode_cache = None
+        # Templates don't change mid-build (serve recreates the builder
+        # on template edits), so skip Jinja's per-render stat calls
         self.env = Environment(
             loader=FileSystemLoader(templates_dir),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload
         )
+        # One fixed timestamp per build keeps relative_time output
+        # consistent (and cacheable) across all pages of the same run.
+        self.build_time = datetime.now()
         self._register_filters()
 
     def _register_filters(self):
@@ -29,32 +57,15 @@ class Renderer:
             
             if not isinstance(value, datetime):
                 return value
-            
-            now = datetime.now()
-            diff = now - value
-            
-            seconds = diff.total_seconds()
-            
+
+            seconds = int((self.build_time - value).total_seconds())
+
             if seconds < 60:
                 return "just now"
-            elif seconds < 3600:
-                minutes = int(seconds / 60)
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            elif seconds < 86400:
-                hours = int(seconds / 3600)
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
-            elif seconds < 604800:
-                days = int(seconds / 86400)
-                return f"{days} day{'s' if days != 1 else ''} ago"
-            elif seconds < 2592000:
-                weeks = int(seconds / 604800)
-                return f"{weeks} week{'s' if weeks != 1 else ''} ago"
-            elif seconds < 31536000:
-                months = int(seconds / 2592000)
-                return f"{months} month{'s' if months != 1 else ''} ago"
-            else:
-                years = int(seconds / 31536000)
-                return f"{years} year{'s' if years != 1 else ''} ago"
+
+            unit, divisor = _TIME_UNITS[bisect_right(_TIME_BOUNDS, seconds) - 1]
+            n = int(seconds / divisor)
+            return f"{n} {unit}{'s' * (n != 1)} ago"
 
         self.env.filters['relative_time'] = relative_time
         
@@ -64,13 +75,14 @@ class Renderer:
                 return content
                 
             permalink_html = f' <a href="{url}" class="micro-permalink" title="Permalink">#</a>'
-            
-            # Try to insert before the closing </p> tag
-            if '</p>' in content:
-                # Find the last occurrence of </p>
-                last_p_index = content.rfind('</p>')
-                return content[:last_p_index] + permalink_html + content[last_p_index:]
-            
+
+            # Try to insert before the last closing </p> tag. rpartition
+            # finds and splits in one pass, and the f-string assembles the
+            # result in a single buffer.
+            head, sep, tail = content.rpartition('</p>')
+            if sep:
+                return f"{head}{permalink_html}{sep}{tail}"
+
             # If no p tag, just append
             return content + permalink_html
 
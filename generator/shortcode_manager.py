@@ -1,103 +1,312 @@
 import re
-import shlex
+import functools
 import importlib
+import inspect
 import os
 import pkgutil
+import sys
 from pathlib import Path
 from typing import Dict, Callable, Any
 
+# Opening tag only: {{< name args >}}.
+# 1. Name (alphanumeric + underscore + hyphen)
+# 2. Args ([^>] cannot cross the closing delimiter)
+# The old combined pattern also matched block bodies with a lazy [\s\S]*?
+# plus a backreference, which forced the engine to attempt (and backtrack
+# over) a closing tag after every opening tag. Block bodies are now found
+# with a plain string search for the closing tag instead, which runs at
+# memchr speed and only for shortcodes registered as blocks.
+_SHORTCODE_RE = re.compile(r'{{<\s*([\w-]+)\s*([^>]*?)\s*>}}')
+
+# Closing tag: {{< /name >}}
+_CLOSE_RE = re.compile(r'{{<\s*/([\w-]+)\s*>}}')
+
+# Shared thread pool for network-backed shortcode renders, created on
+# first use so builds without IO shortcodes never spawn threads
+_io_pool = None
+
+
+def _get_io_pool():
+    global _io_pool
+    if _io_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _io_pool = ThreadPoolExecutor(max_workers=8)
+    return _io_pool
+
+
+def _join_parts(parts) -> str:
+    """Join collected parts, resolving any pending IO-render futures."""
+    return ''.join(p if isinstance(p, str) else p.result() for p in parts)
+
+@functools.lru_cache(maxsize=None)
+def _discover_shortcode_names(shortcode_dir: str):
+    """List available shortcode module names without importing anything.
+
+    pkgutil.iter_modules only stats the directory; the actual import (disk
+    I/O, bytecode parse) is deferred until a shortcode is first dispatched.
+    """
+    shortcode_path = Path(shortcode_dir)
+
+    # Ensure __init__.py exists
+    init_file = shortcode_path / '__init__.py'
+    if not init_file.exists():
+        with open(init_file, 'w') as f:
+            pass
+
+    return frozenset(name for _, name, _ in pkgutil.iter_modules([shortcode_dir]))
+
+
+# Shortcode arg grammar: space-separated key="value" / key='value' /
+# key=bare pairs and quoted or bare positional tokens. A single compiled
+# alternation tokenizes it in the regex engine instead of spinning up a
+# shlex.shlex state machine per call.
+_ARG_RE = re.compile(
+    r'''([\w-]+)=(?:"([^"]*)"|'([^']*)'|(\S+))|"([^"]*)"|'([^']*)'|(\S+)'''
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_args_cached(args_str: str):
+    """Tokenize an args string once; identical arg strings recur across
+    pages. Returns immutable (args tuple, kwargs items tuple) so lru_cache
+    entries can't be mutated by callers."""
+    args = []
+    kwargs = {}
+
+    for match in _ARG_RE.finditer(args_str):
+        key, dq, sq, bare, qarg, sarg, barg = match.groups()
+        if key is not None:
+            kwargs[key] = dq if dq is not None else (sq if sq is not None else bare)
+        elif qarg is not None:
+            args.append(qarg)
+        elif sarg is not None:
+            args.append(sarg)
+        else:
+            args.append(barg)
+
+    return tuple(args), tuple(kwargs.items())
+
+
 class ShortcodeManager:
+    # Shared instance so watch/serve rebuilds don't redo discovery
+    _instance = None
+
+    @classmethod
+    def shared(cls) -> 'ShortcodeManager':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
     def __init__(self, shortcode_dir: str = 'generator/shortcodes'):
         self.shortcode_dir = Path(shortcode_dir)
+        self._available = set(_discover_shortcode_names(shortcode_dir))
+        # Lazily populated on first dispatch of each name
         self.shortcodes: Dict[str, Callable] = {}
-        self._discover_shortcodes()
-        
-        # Regex for {{< name args >}} or block {{< name args >}}...{{< /name >}}
-        # 1. Name (alphanumeric + underscore + hyphen)
-        # 2. Args
-        # 3. Content (optional, if closing tag exists)
-        self.pattern = re.compile(r'{{<\s*([\w-]+)\s*(.*?)\s*>}}(?:(.*?){{<\s*/\1\s*>}})?', re.DOTALL)
-
-    def _discover_shortcodes(self):
-        """Dynamically load shortcode modules."""
-        # Ensure __init__.py exists
-        init_file = self.shortcode_dir / '__init__.py'
-        if not init_file.exists():
-            with open(init_file, 'w') as f:
-                pass
-
-        # Adjust path for importlib
-        # We assume generator.shortcodes is the package
-        package = 'generator.shortcodes'
-        
-        for _, name, _ in pkgutil.iter_modules([str(self.shortcode_dir)]):
-            try:
-                module = importlib.import_module(f'{package}.{name}')
-                if hasattr(module, 'render'):
-                    self.shortcodes[name] = module.render
-                    print(f"Loaded shortcode: {name}")
-            except Exception as e:
-                print(f"Failed to load shortcode {name}: {e}")
+        self._block_shortcodes = set()
+        self._uncacheable = set()
+        # Names whose render may block on the network (IS_IO = True)
+        self._io_shortcodes = set()
+        # Rendered output per (name, args, inner) — the same img/youtube
+        # invocation repeated across pages is only formatted once
+        self._render_cache: Dict[tuple, str] = {}
+
+        self.pattern = _SHORTCODE_RE
 
     def process(self, content: str) -> str:
         """Replace shortcodes in content."""
         if not content:
             return content
-            
-        return self.pattern.sub(self._replace_match, content)
-
-    def _replace_match(self, match) -> str:
-        name = match.group(1)
-        args_str = match.group(2)
-        inner_content = match.group(3) # Can be None
-        
+
+        # C-level substring check; most content (and most block bodies the
+        # recursive call sees) has no shortcodes at all
+        if '{{<' not in content:
+            return content
+
+        # Single linear scan, iterative. Seek candidates with str.find
+        # (C-level substring search) and only run the regex anchored at
+        # each '{{<', so the engine never scans the prose in between.
+        # Block shortcodes push a frame on an explicit stack instead of
+        # recursing, so nested blocks cost no re-scan of their bodies.
+        # Frame: [name, args_str, original_tag, parts]
+        stack = [[None, None, None, []]]
+        pos = 0
+        find = content.find
+        while True:
+            i = find('{{<', pos)
+            parts = stack[-1][3]
+            if i < 0:
+                parts.append(content[pos:])
+                break
+
+            close = _CLOSE_RE.match(content, i)
+            if close:
+                lookup_name = close.group(1).replace('-', '_')
+                depth = len(stack) - 1
+                while depth > 0 and stack[depth][0] != lookup_name:
+                    depth -= 1
+                if depth == 0:
+                    # Closer with no matching open block: keep it verbatim
+                    parts.append(content[pos:close.end()])
+                    pos = close.end()
+                    continue
+
+                parts.append(content[pos:i])
+                # Any blocks opened inside that never closed render as
+                # inline tags, their collected body spliced back after
+                # them (matching the old optional-closer behavior)
+                self._unwind_to(stack, depth)
+                name, args_str, original, inner_parts = stack.pop()
+                rendered = self._render_shortcode(name, args_str, _join_parts(inner_parts), original)
+                stack[-1][3].append(rendered)
+                pos = close.end()
+                continue
+
+            match = self.pattern.match(content, i)
+            if not match:
+                # A '{{<' that isn't a well-formed tag: keep it verbatim
+                # and continue after it
+                parts.append(content[pos:i + 3])
+                pos = i + 3
+                continue
+
+            parts.append(content[pos:i])
+
+            name = match.group(1)
+            lookup_name = name.replace('-', '_')
+            self._ensure_loaded(lookup_name)
+            if lookup_name in self._block_shortcodes:
+                # Frame name is the lookup form so closers match regardless
+                # of hyphen/underscore spelling
+                stack.append([lookup_name, match.group(2), match.group(0), []])
+            elif lookup_name in self._io_shortcodes:
+                # Network-backed renders run on the IO pool; the future is
+                # a placeholder resolved when the parts are joined, so
+                # several embeds on one page overlap their round-trips
+                parts.append(_get_io_pool().submit(
+                    self._render_shortcode, name, match.group(2), None, match.group(0)))
+            else:
+                parts.append(self._render_shortcode(name, match.group(2), None, match.group(0)))
+            pos = match.end()
+
+        self._unwind_to(stack, 0)
+        return _join_parts(stack[0][3])
+
+    def _unwind_to(self, stack, depth: int) -> None:
+        """Pop unclosed block frames above depth, rendering each as an
+        inline tag followed by its collected body."""
+        while len(stack) - 1 > depth:
+            name, args_str, original, inner_parts = stack.pop()
+            parent_parts = stack[-1][3]
+            parent_parts.append(self._render_shortcode(name, args_str, None, original))
+            parent_parts.extend(inner_parts)
+
+    def prewarm(self, contents) -> None:
+        """Resolve network-backed shortcode lookups concurrently.
+
+        Scans content for soundcloud URL embeds and resolves them all on a
+        thread pool up front, so the later (serial) renders are pure cache
+        hits instead of one blocking round-trip each.
+        """
+        urls = set()
+        for content in contents:
+            if not content or '{{<' not in content:
+                continue
+            for match in self.pattern.finditer(content):
+                if match.group(1) != 'soundcloud':
+                    continue
+                args, _ = self._parse_args(match.group(2))
+                if args and str(args[0]).startswith('http'):
+                    urls.add(args[0])
+
+        if not urls:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+        from .shortcodes import soundcloud
+
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as pool:
+            # Consume the iterator so worker exceptions surface here
+            list(pool.map(soundcloud._resolve, urls))
+
+    def _ensure_loaded(self, lookup_name: str):
+        """Import a shortcode module on first use; return its render callable."""
+        # Single dict lookup serves both the loaded check and dispatch
+        fn = self.shortcodes.get(lookup_name)
+        if fn is not None:
+            return fn
+        if lookup_name not in self._available:
+            return None
+
+        modpath = f'generator.shortcodes.{lookup_name}'
+        try:
+            # Serve/watch rebuilds hit this path repeatedly; modules already
+            # imported are fetched from sys.modules without importlib overhead
+            module = sys.modules.get(modpath) or importlib.import_module(modpath)
+        except Exception as e:
+            print(f"Failed to load shortcode {lookup_name}: {e}")
+            self._available.discard(lookup_name)
+            return None
+
+        fn = getattr(module, 'render', None)
+        if fn is None:
+            self._available.discard(lookup_name)
+            return None
+
+        self.shortcodes[lookup_name] = fn
+        # A render function taking 'content' is a block shortcode; modules
+        # can force it either way with an explicit IS_BLOCK attribute
+        is_block = getattr(module, 'IS_BLOCK', None)
+        if is_block is None:
+            try:
+                is_block = 'content' in inspect.signature(fn).parameters
+            except (TypeError, ValueError):
+                is_block = False
+        if is_block:
+            self._block_shortcodes.add(lookup_name)
+        if not getattr(module, 'CACHEABLE', True):
+            self._uncacheable.add(lookup_name)
+        if getattr(module, 'IS_IO', False):
+            self._io_shortcodes.add(lookup_name)
+        print(f"Loaded shortcode: {lookup_name}")
+        return fn
+
+    def _render_shortcode(self, name: str, args_str: str, inner_content, original: str) -> str:
         # Normalize hyphens to underscores for python module lookup
         lookup_name = name.replace('-', '_')
-        
-        if lookup_name not in self.shortcodes:
+
+        fn = self._ensure_loaded(lookup_name)
+        if fn is None:
             print(f"Warning: Shortcode '{name}' (lookup: '{lookup_name}') not found.")
-            return match.group(0) # Return original text
-            
+            return original # Return original text
+
+        cacheable = lookup_name not in self._uncacheable
+        if cacheable:
+            cache_key = (lookup_name, args_str, inner_content)
+            cached = self._render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         args, kwargs = self._parse_args(args_str)
-        
-        # Pass inner content if it exists
+
+        # Pass inner content if it exists (already fully processed by the
+        # scanner's stack, so no recursion here)
         if inner_content is not None:
-            # Recursively process shortcodes within the block
-            inner_content = self.process(inner_content)
             kwargs['content'] = inner_content
-        
+
         try:
-            return str(self.shortcodes[lookup_name](*args, **kwargs))
+            rendered = str(fn(*args, **kwargs))
         except Exception as e:
             print(f"Error rendering shortcode '{name}': {e}")
             return f"<!-- Error rendering {name}: {e} -->"
 
+        if cacheable:
+            self._render_cache[cache_key] = rendered
+        return rendered
+
     def _parse_args(self, args_str: str):
         """
-        Parse arguments string into *args and **kwargs using shlex.
+        Parse arguments string into *args and **kwargs (memoized by string).
         """
-        args = []
-        kwargs = {}
-        
-        try:
-            tokens = shlex.split(args_str)
-        except ValueError as e:
-            print(f"Error parsing shortcode args: {e}")
-            return args, kwargs
-
-        for token in tokens:
-            if '=' in token:
-                # Potential keyword argument
-                # But careful: "foo=bar" is key=val, but "url=http://..." is also key=val
-                # shlex keeps quoted strings together. 
-                # If the token starts with something=, we treat it as kwarg.
-                # However, shlex.split("key='val'") results in ["key=val"] (quotes removed by shell logic if they surround value)
-                
-                parts = token.split('=', 1)
-                key = parts[0]
-                val = parts[1]
-                kwargs[key] = val
-            else:
-                args.append(token)
-                
-        return args, kwargs
+        args, kwargs_items = _parse_args_cached(args_str)
+        # Fresh containers per call: render functions may mutate kwargs
+        return list(args), dict(kwargs_items)
@@ -0,0 +1,10 @@
+import functools
+import html
+
+
+@functools.lru_cache(maxsize=8192)
+def _esc(s) -> str:
+    """HTML-escape an attribute value, memoized: the same src/alt/title
+    strings recur across many pages, so each distinct value is escaped
+    once per build."""
+    return html.escape(str(s), quote=True)
@@ -1,5 +1,5 @@
-import random
-import string
+# Output embeds a random uid, so identical invocations must not share HTML
+CACHEABLE = False
 
 def render(address, text=None):
     """
@@ -12,15 +12,17 @@ def render(address, text=None):
     if not text:
         text = address
         
-    # Helper to encode string to JS char codes
+    # Helper to encode string to JS char codes; one fromCharCode call with
+    # all the codes beats N concatenated single-char calls
     def encode_to_js(s):
-        return "+".join([f"String.fromCharCode({ord(c)})" for c in s])
+        return "String.fromCharCode(" + ",".join(str(ord(c)) for c in s) + ")"
         
     js_address = encode_to_js(address)
     js_text = encode_to_js(text)
     
-    # Generate unique ID for this instance
-    uid = ''.join(random.choice(string.ascii_letters) for _ in range(8))
+    # Generate unique ID for this instance (one C call, no per-char loop)
+    import secrets
+    uid = secrets.token_hex(4)
     
     return f"""
     <span id="mail-{uid}"></span>
@@ -1,20 +1,9 @@
-def render(src: str, alt: str = "", caption: str = "", width: str = "100%", cls: str = ""):
-    """
-    Renders an image, optionally with a caption using <figure>.
-    Usage: 
-    {{< img src="/path/to/image.jpg" alt="Description" >}}
-    {{< img "/path/to/image.jpg" "Description" >}}
-    """
-    
-    # Clean up arguments
-    if not alt:
-        alt = "Image"
-        
-    style = f"max-width: {width}; height: auto; border-radius: 8px;"
-    img_tag = f'<img src="{src}" alt="{alt}" class="{cls}" style="{style}" loading="lazy">'
-    
-    if caption:
-        html = f"""
+from . import _esc
+
+# Templates built once at import; render fills them with format_map
+_IMG_TMPL = '<img src="{src}" alt="{alt}" class="{cls}" style="max-width: {width}; height: auto; border-radius: 8px;" loading="lazy">'
+
+_FIG_TMPL = """
 <figure style="margin: 1.5rem 0; text-align: center;">
     {img_tag}
     <figcaption style="margin-top: 0.5rem; color: #666; font-style: italic; font-size: 0.9em;">
@@ -22,11 +11,31 @@ def render(src: str, alt: str = "", caption: str = "", width: str = "100%", cls:
     </figcaption>
 </figure>
 """
-    else:
-        # Just the image, perhaps wrapped for spacing
-        html = f"""
+
+_DIV_TMPL = """
 <div style="margin: 1.5rem 0;">
     {img_tag}
 </div>
 """
-    return html
+
+
+def render(src: str, alt: str = "", caption: str = "", width: str = "100%", cls: str = ""):
+    """
+    Renders an image, optionally with a caption using <figure>.
+    Usage:
+    {{< img src="/path/to/image.jpg" alt="Description" >}}
+    {{< img "/path/to/image.jpg" "Description" >}}
+    """
+
+    # Clean up arguments
+    if not alt:
+        alt = "Image"
+
+    img_tag = _IMG_TMPL.format_map({'src': _esc(src), 'alt': _esc(alt),
+                                    'cls': _esc(cls), 'width': _esc(width)})
+
+    if caption:
+        return _FIG_TMPL.format_map({'img_tag': img_tag, 'caption': _esc(caption)})
+
+    # Just the image, perhaps wrapped for spacing
+    return _DIV_TMPL.format_map({'img_tag': img_tag})
@@ -1,3 +1,10 @@
+# All 11 half-star strings on a 5-star scale, indexed by round(score*2)
+_STARS = tuple(
+    "★" * (i // 2) + ("⯨" if i & 1 else "") + "☆" * (5 - i // 2 - (i & 1))
+    for i in range(11)
+)
+
+
 def render(score: str, max_score: str = "10"):
     """
     Renders a star rating.
@@ -6,16 +13,11 @@ def render(score: str, max_score: str = "10"):
     try:
         val = float(score)
         maximum = float(max_score)
-        
-        # Normalize to 5-star scale
-        normalized = (val / maximum) * 5
-        
-        full = int(normalized)
-        half = (normalized - full) >= 0.5
-        empty = 5 - full - (1 if half else 0)
-        
-        stars = "★" * full + ("⯨" if half else "") + "☆" * empty
-        
-        return f'<span class="review-stars" title="{val}/{maximum}">{stars}</span>'
+
+        # Normalize to half-stars and index the precomputed table; no
+        # per-call string multiplication
+        idx = max(0, min(10, round(val / maximum * 10)))
+
+        return f'<span class="review-stars" title="{val}/{maximum}">{_STARS[idx]}</span>'
     except ValueError:
         return f'<!-- Invalid rating: {score}/{max_score} -->'
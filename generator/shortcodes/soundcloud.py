@@ -1,13 +1,89 @@
-import urllib.request
-import urllib.parse
+import functools
 import json
 import hashlib
 import re
 from pathlib import Path
 
-# Simple disk cache
+from . import _esc
+
+# Rendering may hit the network, so renders can run on the IO pool
+IS_IO = True
+
+# Simple disk cache; created lazily on the first write
 CACHE_DIR = Path(".cache/soundcloud")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Track id appears as tracks/<id> or URL-encoded tracks%2F<id>; one
+# compiled alternation covers both in a single pass
+_TRACK_RE = re.compile(r'tracks(?:/|%2F)(\d+)')
+
+
+@functools.lru_cache(maxsize=1024)
+def _lookup_cached_track(url_hash: str):
+    """Read a cached track id from disk, memoized so the same embed
+    repeated across pages only pays open+json.load once per build."""
+    # EAFP: one open syscall instead of stat-then-open (and no race
+    # between the two)
+    try:
+        with open(CACHE_DIR / f"{url_hash}.json", 'rb') as f:
+            return json.load(f).get('track_id')
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve(url: str):
+    """Resolve a SoundCloud URL to a track id, via cache or oembed fetch.
+
+    Memoized, so it is safe (and cheap) to call both from a concurrent
+    prewarm pass and again at render time. Returns None on failure.
+    """
+    # Check cache (blake2b is a C implementation, faster than md5)
+    url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+    cache_file = CACHE_DIR / f"{url_hash}.json"
+
+    cached_id = _lookup_cached_track(url_hash)
+    if cached_id:
+        return cached_id
+
+    # Cache miss: resolve the track id via the oembed endpoint. urllib is
+    # imported here so embed-free builds never pay for it.
+    import urllib.parse
+    import urllib.request
+    try:
+        params = urllib.parse.urlencode({'format': 'json', 'url': url})
+        oembed_url = f"https://soundcloud.com/oembed?{params}"
+
+        req = urllib.request.Request(
+            oembed_url,
+            headers={'User-Agent': 'Mozilla/5.0'}
+        )
+
+        with urllib.request.urlopen(req) as response:
+            if response.status == 200:
+                data = json.loads(response.read().decode('utf-8'))
+                html_resp = data.get('html', '')
+
+                # Extract ID
+                match = _TRACK_RE.search(html_resp)
+
+                if match:
+                    track_id = match.group(1)
+                    # Cache it
+                    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    with open(cache_file, 'w') as f:
+                        json.dump({'track_id': track_id}, f)
+                    return track_id
+                else:
+                    print(f"Could not extract Track ID for {url}")
+                    # Fallback to display errors or placeholder?
+                    # For now, let it fall through, it will likely fail in iframe
+            else:
+                print(f"Error resolving SoundCloud URL: {response.status}")
+    except Exception as e:
+        print(f"Exception resolving SoundCloud ID: {e}")
+    return None
 
 def render(id_or_url: str, visual: str = "true", title: str = "SoundCloud Player"):
     """
@@ -24,57 +100,12 @@ def render(id_or_url: str, visual: str = "true", title: str = "SoundCloud Player
     """
     
     track_id = id_or_url
-    
+
     # Check if input looks like a URL
     if str(id_or_url).startswith('http'):
-        url = id_or_url
-        # Check cache
-        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
-        cache_file = CACHE_DIR / f"{url_hash}.json"
-        
-        cached_id = None
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    cached_id = data.get('track_id')
-            except:
-                pass
-                
-        if cached_id:
-            track_id = cached_id
-            try:
-                params = urllib.parse.urlencode({'format': 'json', 'url': url})
-                oembed_url = f"https://soundcloud.com/oembed?{params}"
-                
-                req = urllib.request.Request(
-                    oembed_url, 
-                    headers={'User-Agent': 'Mozilla/5.0'}
-                )
-
-                with urllib.request.urlopen(req) as response:
-                    if response.status == 200:
-                        data = json.loads(response.read().decode('utf-8'))
-                        html_resp = data.get('html', '')
-                        
-                        # Extract ID
-                        match = re.search(r'tracks/(\d+)', html_resp)
-                        if not match:
-                            match = re.search(r'tracks%2F(\d+)', html_resp)
-                            
-                        if match:
-                            track_id = match.group(1)
-                            # Cache it
-                            with open(cache_file, 'w') as f:
-                                json.dump({'track_id': track_id}, f)
-                        else:
-                            print(f"Could not extract Track ID for {url}")
-                            # Fallback to display errors or placeholder? 
-                            # For now, let it fall through, it will likely fail in iframe
-                    else:
-                        print(f"Error resolving SoundCloud URL: {response.status}")
-            except Exception as e:
-                print(f"Exception resolving SoundCloud ID: {e}")
+        resolved = _resolve(id_or_url)
+        if resolved:
+            track_id = resolved
 
     # Handle string 'true'/'false'
     visual_param = "true" if str(visual).lower() == 'true' else "false"
@@ -82,8 +113,8 @@ def render(id_or_url: str, visual: str = "true", title: str = "SoundCloud Player
     html = f"""
 <div style="width: 100%; height: 166px; margin-bottom: 1.5rem; overflow: hidden; border-radius: 8px;">
     <iframe width="100%" height="166" scrolling="no" frameborder="no" allow="autoplay" 
-        src="https://w.soundcloud.com/player/?url=https%3A//api.soundcloud.com/tracks/{track_id}&color=%23ff5500&auto_play=false&hide_related=false&show_comments=true&show_user=true&show_reposts=false&show_teaser=true&visual={visual_param}"
-        title="{title}">
+        src="https://w.soundcloud.com/player/?url=https%3A//api.soundcloud.com/tracks/{_esc(track_id)}&color=%23ff5500&auto_play=false&hide_related=false&show_comments=true&show_user=true&show_reposts=false&show_teaser=true&visual={visual_param}"
+        title="{_esc(title)}">
     </iframe>
 </div>
 """
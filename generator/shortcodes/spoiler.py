@@ -1,11 +1,21 @@
-def render(title: str = "Spoiler", content: str = ""):
-    """
-    Renders a spoiler block with hidden content.
-    Usage: {{< spoiler "Title" >}} Content... {{< /spoiler >}}
-    """
-    return f"""
+from . import _esc
+
+# Takes a body and a closing {{< /spoiler >}} tag
+IS_BLOCK = True
+
+# Template built once at import; render fills it with format_map
+_TMPL = """
 <details markdown="1" style="border: 1px solid #ddd; padding: 1rem; border-radius: 8px; margin: 1rem 0;">
 <summary style="cursor: pointer; font-weight: bold; margin-bottom: 1rem;">{title}</summary>
 {content}
 </details>
 """
+
+
+def render(title: str = "Spoiler", content: str = ""):
+    """
+    Renders a spoiler block with hidden content.
+    Usage: {{< spoiler "Title" >}} Content... {{< /spoiler >}}
+    """
+    # The title lands in HTML; the body is markdown and stays untouched
+    return _TMPL.format_map({'title': _esc(title), 'content': content})
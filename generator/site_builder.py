@@ -1,13 +1,37 @@
+import functools
+import heapq
+import html as html_module
+import io
 import os
+import re
 import shutil
 import rcssmin
 import rjsmin
 import sass
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from urllib.parse import urlparse
 from PIL import Image
 import json
 
+# orjson serializes straight to UTF-8 bytes several times faster than
+# stdlib json; the search index and build caches are the big payloads.
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+
+
+def _json_dumps(obj) -> bytes:
+    if _json_fast:
+        return _json_fast.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data):
+    return (_json_fast or json).loads(data)
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
@@ -17,6 +41,176 @@ from .renderer import Renderer
 from .models import ContentItem, CONTENT_TYPES
 from .data_loader import DataLoader
 
+# Below this many posts the process-pool startup cost outweighs the
+# parallel rendering win (mirrors the content loader's threshold).
+_MIN_PARALLEL_RENDER = 16
+
+# lxml parses HTML in C, many times faster than the pure-Python
+# html.parser; these passes run on every rendered page.
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
+
+# Tag stripping for the search index: scripts/styles vanish wholly,
+# remaining tags become spaces, whitespace collapses. A regex pass is
+# far cheaper than building a DOM just to throw it away.
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Placeholders understood by locale date format templates; one compiled
+# alternation replaces the old chain of sequential str.replace passes.
+_DATE_FMT_RE = re.compile(r'\{(day|0day|year|month|short_month|weekday)\}')
+
+
+def _strip_tags(html: str) -> str:
+    text = _SCRIPT_STYLE_RE.sub(' ', html)
+    text = _TAG_RE.sub(' ', text)
+    return _WS_RE.sub(' ', html_module.unescape(text)).strip()
+
+
+@functools.lru_cache(maxsize=65536)
+def _relpath_cached(from_url: str, to_url: str) -> str:
+    """
+    Calculate relative path from current URL to target URL.
+    Useful for fully portable static sites (subfolder deployment).
+
+    Memoized: the rel_url filter calls this for every link on every page,
+    but the distinct (from, to) pairs are few (navigation links repeat
+    across the whole site).
+    """
+    # Ensure URLs start with / for logic consistency
+    if not from_url.startswith('/'): from_url = '/' + from_url
+    if not to_url.startswith('/'): to_url = '/' + to_url
+
+    # Remove file name from from_url to get source directory
+    # If from_url ends with /, it is a directory.
+    # If it doesn't (like /index.html or /404.html), we need dirname.
+    if from_url.endswith('/'):
+        from_dir = from_url
+    else:
+        from_dir = os.path.dirname(from_url)
+
+    # Remove leading slash for os.path.relpath to work
+    from_dir = from_dir.lstrip('/') or '.'
+    to_url = to_url.lstrip('/') or '.'
+
+    try:
+        rel_path = os.path.relpath(to_url, from_dir)
+        # Preserve trailing slash if original had it and rel_path doesn't
+        if to_url.endswith('/') and not rel_path.endswith('/'):
+             rel_path += '/'
+        return rel_path
+    except ValueError:
+        return to_url
+
+# Per-worker SiteBuilder, set up once by the pool initializer. Jinja
+# environments can't cross process boundaries, so each worker builds its
+# own and then adopts the parent's config and post list for consistent
+# output (footer message, related posts, internal links).
+_worker_builder = None
+
+
+def _init_render_worker(include_drafts, config, all_posts):
+    global _worker_builder
+    _worker_builder = SiteBuilder(include_drafts=include_drafts)
+    _worker_builder.config = config
+    _worker_builder.all_posts = all_posts
+    _worker_builder.shortname_map = {p.shortname: p for p in all_posts if p.shortname}
+    _worker_builder._build_taxonomy_indexes(all_posts)
+
+
+def _render_post_task(post):
+    _worker_builder._render_post(post)
+
+
+def _render_tag_task(tag):
+    _worker_builder._render_tag_page(tag, _worker_builder.tag_index[tag])
+
+
+def _render_category_task(cat):
+    _worker_builder._render_category_page(cat, _worker_builder.cat_index[cat])
+
+
+# Minimum number of images/stylesheets before asset work moves to a pool
+_MIN_PARALLEL_ASSETS = 4
+
+
+def _scandir_files(top):
+    """Yield a DirEntry for every file under top, depth-first.
+
+    os.scandir exposes file type and stat results from the directory
+    read itself, so the asset walks don't pay an extra stat per entry
+    the way os.walk callers typically do.
+    """
+    stack = [top]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue
+
+
+def _optimize_image_worker(pair):
+    """Resize/re-encode one image plus its WebP twin (pool-safe)."""
+    src_file, dst_file = pair
+    try:
+        with Image.open(src_file) as img:
+            # Resize if larger than 1200px
+            if img.width > 1200:
+                ratio = 1200 / img.width
+                new_height = int(img.height * ratio)
+                img = img.resize((1200, new_height), Image.Resampling.LANCZOS)
+
+                # Save optimized original
+                def save_original():
+                    img.save(dst_file, optimize=True, quality=85)
+            else:
+                # Already small enough: copy the bytes as-is instead of
+                # paying a full decode + re-encode cycle
+                def save_original():
+                    shutil.copy2(src_file, dst_file)
+
+            # Generate WebP (method=4 trades a little compression for a
+            # much faster encode than the slower search levels).
+            # Pillow releases the GIL while encoding, so the two output
+            # writes overlap on a pair of threads. Decode fully first so
+            # both threads read settled pixel data.
+            img.load()
+            webp_path = dst_file.with_suffix('.webp')
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [
+                    pool.submit(save_original),
+                    pool.submit(img.save, webp_path, 'WEBP', quality=85, method=4),
+                ]
+                for future in futures:
+                    future.result()
+    except Exception as e:
+        print(f"Error optimizing image {src_file}: {e}")
+        shutil.copy2(src_file, dst_file)
+
+
+def _compile_scss_worker(pair):
+    """Compile one Sass entry point to minified CSS (pool-safe)."""
+    src_file, css_dst = pair
+    try:
+        # Compile Sass with minification
+        compiled_css = sass.compile(filename=str(src_file), output_style='compressed')
+        with open(css_dst, 'w', encoding='utf-8') as f:
+            f.write(compiled_css)
+    except Exception as e:
+        print(f"Error compiling Sass {src_file}: {e}")
+
+
 class SiteBuilder:
     """
     Orchestrates the entire static site generation process.
@@ -25,8 +219,21 @@ class SiteBuilder:
     to produce the final static output. It follows a sequential build pipeline:
     Clean -> Prepare -> Load Content -> Render Posts -> Render Indices -> Generate Feeds/Sitemaps.
     """
-    def __init__(self, config_path: str = 'config.yaml', include_drafts: bool = False):
+    def __init__(self, config_path: str = 'config.yaml', include_drafts: bool = False, jobs: int = None, incremental: bool = False):
         self.config = load_config(config_path)
+        # Worker count for parallel post rendering; None = one per CPU
+        self.jobs = jobs
+        # Incremental mode keeps the output directory and skips posts whose
+        # rendered file is newer than their source (and all global inputs)
+        self.incremental = incremental
+        self._outputs = set()
+        self._global_mtime = 0.0
+        self._written_writes = 0
+        self._skipped_writes = 0
+        # Rendered nav fragments keyed on (depth, is_home): pages at the
+        # same directory depth produce byte-identical nav HTML, so the
+        # partial only needs one render per depth instead of one per page
+        self._nav_cache = {}
         
         # Load Data
         data_loader = DataLoader('data')
@@ -45,7 +252,9 @@ class SiteBuilder:
         self.slugs = self.locale_data.get('slugs', {})
         self.renderer.env.globals['slugs'] = self.slugs
             
-        # Register Format Date Filter
+        # Register Format Date Filter. The formatting core is memoized:
+        # the same (date, format) pairs recur on every index/listing page.
+        self._format_localedate = functools.lru_cache(maxsize=8192)(self._format_localedate_uncached)
         self.renderer.env.filters['localedate'] = self._localedate_filter
         
         # Pass jinja_env and site context (self.config) to ContentLoader
@@ -60,18 +269,52 @@ class SiteBuilder:
         self.output_dir = Path(self.config.output_dir)
         self.include_drafts = include_drafts
 
+        # Template names listed once; saves a stat syscall per post when
+        # probing for a type-specific template
+        try:
+            self._available_templates = set(os.listdir('templates'))
+        except OSError:
+            self._available_templates = set()
+
     def _load_locale(self) -> Dict[str, Any]:
-        """Load the locale file specified in config."""
+        """Load the locale file specified in config.
+
+        The parsed dict is cached as JSON under .cache/ keyed on the
+        source mtime: YAML parsing is orders of magnitude slower than a
+        json.loads, and the locale rarely changes between builds.
+        """
         lang = self.config.language
         locale_path = Path(f'i18n/{lang}.yaml')
-        
+
         if not locale_path.exists():
             print(f"Warning: Locale file '{locale_path}' not found. Falling back to empty.")
             return {}
-            
+
+        cache_file = Path(f'.cache/locale_{lang}.json')
+        try:
+            if cache_file.stat().st_mtime >= locale_path.stat().st_mtime:
+                return _json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+
         import yaml
+        # Use the libyaml C loader when available (much faster than pure Python)
+        try:
+            from yaml import CSafeLoader as _Loader
+        except ImportError:
+            from yaml import SafeLoader as _Loader
         with open(locale_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_Loader) or {}
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(_json_dumps(data))
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"Warning: Failed to cache locale data: {e}")
+
+        return data
 
     def _localedate_filter(self, date_obj, format_str='format'):
         """
@@ -93,30 +336,33 @@ class SiteBuilder:
         if 'date' not in self.locale_data:
             return date_obj.strftime("%Y-%m-%d")
 
+        return self._format_localedate(date_obj, format_str)
+
+    def _format_localedate_uncached(self, date_obj, format_str):
         date_config = self.locale_data['date']
-        
+
         fmt_template = date_config.get(format_str, date_config.get('format', "{day} {month} {year}"))
-        
-        # Prepare replacements
+
         day = date_obj.day
         month_index = date_obj.month - 1 # 0-indexed
         day_index = date_obj.weekday() # 0 = Monday
-        
-        replacements = {
-            "{day}": str(day),
-            "{0day}": f"{day:02d}",
-            "{year}": str(date_obj.year),
-            "{month}": date_config['months'][month_index] if 'months' in date_config else str(date_obj.month),
-            "{short_month}": date_config['short_months'][month_index] if 'short_months' in date_config else str(date_obj.month),
-            "{weekday}": date_config['days'][day_index] if 'days' in date_config else str(day_index),
-        }
-        
-        result = fmt_template
-        for key, value in replacements.items():
-            result = result.replace(key, value)
-            
-        return result
-        
+
+        def replace_token(match):
+            token = match.group(1)
+            if token == 'day':
+                return str(day)
+            if token == '0day':
+                return f"{day:02d}"
+            if token == 'year':
+                return str(date_obj.year)
+            if token == 'month':
+                return date_config['months'][month_index] if 'months' in date_config else str(date_obj.month)
+            if token == 'short_month':
+                return date_config['short_months'][month_index] if 'short_months' in date_config else str(date_obj.month)
+            return date_config['days'][day_index] if 'days' in date_config else str(day_index)
+
+        return _DATE_FMT_RE.sub(replace_token, fmt_template)
+
     def clean(self):
         """Clean the output directory."""
         if self.output_dir.exists():
@@ -128,9 +374,15 @@ class SiteBuilder:
         This is the main entry point for the static site generation.
         """
         print(f"Building site '{self.config.title}'...")
-        
-        self.clean()
-        self._prepare_output_directory()
+
+        self._outputs = set()
+        self._written_writes = 0
+        self._skipped_writes = 0
+        if self.incremental:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            self.clean()
+            self._prepare_output_directory()
         
         
         
@@ -183,12 +435,11 @@ class SiteBuilder:
         self.all_posts = posts
         self.shortname_map = {p.shortname: p for p in posts if p.shortname}
 
+        # One pass over the corpus builds the tag and category indexes
+        # that taxonomy pages and related-post lookups all share
+        self._build_taxonomy_indexes(posts)
 
-        for post in posts:
-            self._render_post(post)
-            
-        # Render Index (Home Stream)
-        # Filter posts based on feature flags
+        # Filter posts for the index (home stream) based on feature flags
         index_posts = []
         for post in posts:
             if post.type == 'reviews' and not self.config.features.get('reviews_in_index', True):
@@ -202,7 +453,43 @@ class SiteBuilder:
             if post.hide_from_home:
                 continue
             index_posts.append(post)
-            
+
+        # Every target directory is known up front, so create them all in
+        # one pass instead of a stat+mkdir per rendered file
+        self._create_output_dirs(posts, index_posts)
+
+        # Incremental: only re-render posts whose output is older than
+        # their source file or any global input (templates, locale, config)
+        if self.incremental:
+            self._global_mtime = self._invalidation_mtime()
+            to_render = [p for p in posts if self._post_needs_render(p)]
+            skipped = len(posts) - len(to_render)
+            if skipped:
+                print(f"  ✔ {skipped} posts up to date (skipped)")
+        else:
+            to_render = posts
+
+        # Rendering is CPU-bound and independent per post, so large
+        # corpora are split across a worker pool; small sites (or
+        # --jobs 1) stay on the cheap serial path.
+        rendered = False
+        if self.jobs != 1 and len(to_render) >= _MIN_PARALLEL_RENDER:
+            try:
+                self._render_posts_parallel(to_render)
+                rendered = True
+            except Exception as e:
+                print(f"Warning: Parallel rendering failed ({e}), falling back to serial.")
+
+        if not rendered:
+            for post in to_render:
+                self._render_post(post)
+
+        # All post outputs belong in the manifest, including skipped ones
+        # and those written by pool workers
+        for post in posts:
+            self._outputs.add(post.url.strip('/') + '/index.html')
+
+        # Render Index (Home Stream)
         self._render_index(index_posts)
         
         self._render_sections(posts)
@@ -230,15 +517,156 @@ class SiteBuilder:
         self._generate_search_page()
         
         self._generate_humans_txt()
-        
+
+        self._finalize_manifest()
+
+        if self._skipped_writes:
+            print(f"  ✔ {self._written_writes} files written, {self._skipped_writes} unchanged")
+
         print("Build complete.")
 
 
 
+    def _build_taxonomy_indexes(self, posts: List[ContentItem]):
+        """Build tag/category inverted indexes in a single pass."""
+        self.tag_index = defaultdict(list)
+        self.cat_index = defaultdict(list)
+        for post in posts:
+            for tag in post.tags:
+                self.tag_index[tag].append(post)
+            if post.category:
+                self.cat_index[post.category].append(post)
+
+    def _create_output_dirs(self, posts: List[ContentItem], index_posts: List[ContentItem]):
+        """Create all render target directories in a single upfront pass.
+
+        The render methods then write straight into them without each
+        paying a redundant stat+mkdir for every output file.
+        """
+        dirs = {self.output_dir / p.url.strip('/') for p in posts}
+
+        # Pagination pages (page 1 is the root index)
+        per_page = self.config.posts_per_page
+        total_pages = (len(index_posts) + per_page - 1) // per_page
+        for page_num in range(2, total_pages + 1):
+            dirs.add(self.output_dir / 'page' / str(page_num))
+
+        # Sections (with localized slugs)
+        slugs = self.locale_data.get('slugs', {})
+        for section in set(CONTENT_TYPES.keys()) | {p.type for p in posts}:
+            dirs.add(self.output_dir / slugs.get(section, section))
+
+        if self.config.features.get('tags'):
+            for tag in self.tag_index:
+                dirs.add(self.output_dir / 'tags' / tag)
+            dirs.add(self.output_dir / 'index')
+
+        if self.config.features.get('categories'):
+            for cat in self.cat_index:
+                cat_slug = cat.lower().replace(' ', '-')
+                dirs.add(self.output_dir / 'categories' / cat_slug)
+
+        dirs.add(self.output_dir / 'search')
+
+        for d in dirs:
+            d.mkdir(parents=True, exist_ok=True)
+
+    def _invalidation_mtime(self) -> float:
+        """Newest mtime among the global inputs every page depends on."""
+        newest = 0.0
+        try:
+            newest = os.stat('config.yaml').st_mtime
+        except OSError:
+            pass
+        for top in ('templates', 'i18n'):
+            for root, _, files in os.walk(top):
+                for name in files:
+                    try:
+                        newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+                    except OSError:
+                        pass
+        return newest
+
+    def _post_needs_render(self, post: ContentItem) -> bool:
+        out_file = self.output_dir / post.url.strip('/') / 'index.html'
+        try:
+            out_mtime = out_file.stat().st_mtime
+            src_mtime = os.stat(post.path).st_mtime
+        except OSError:
+            return True
+        return out_mtime < src_mtime or out_mtime < self._global_mtime
+
+    def _write_output(self, path, content: str):
+        """Write a rendered output file and record it in the build manifest.
+
+        Skips the write when the bytes on disk are already identical, so
+        rebuilds that re-render but don't change a page cost a read
+        instead of a write (and keep the file's mtime, which the
+        incremental skip and deploy tooling rely on).
+        """
+        path = Path(path)
+        data = content.encode('utf-8')
+        try:
+            if path.read_bytes() == data:
+                self._outputs.add(path.relative_to(self.output_dir).as_posix())
+                self._skipped_writes += 1
+                return
+        except OSError:
+            pass
+        path.write_bytes(data)
+        self._outputs.add(path.relative_to(self.output_dir).as_posix())
+        self._written_writes += 1
+
+    def _finalize_manifest(self):
+        """Prune outputs gone since the last build and persist the manifest.
+
+        Only files recorded in a previous manifest are candidates for
+        pruning, so copied assets are never touched.
+        """
+        manifest_file = Path('.cache/build_manifest.json')
+        if self.incremental:
+            try:
+                previous = _json_loads(manifest_file.read_bytes())
+            except Exception:
+                previous = []
+            for rel in previous:
+                if rel not in self._outputs:
+                    stale = self.output_dir / rel
+                    try:
+                        stale.unlink()
+                        # Drop now-empty directories up to the output root
+                        parent = stale.parent
+                        while parent != self.output_dir and not any(parent.iterdir()):
+                            parent.rmdir()
+                            parent = parent.parent
+                    except OSError:
+                        pass
+
+        try:
+            manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            manifest_file.write_bytes(_json_dumps(sorted(self._outputs)))
+        except Exception as e:
+            print(f"Warning: Failed to save build manifest: {e}")
+
+    def _render_posts_parallel(self, posts: List[ContentItem]):
+        """Render posts across CPU cores with a per-worker SiteBuilder."""
+        self._render_parallel(_render_post_task, posts)
+
+    def _render_parallel(self, task_fn, items):
+        """Run render tasks across CPU cores with a per-worker SiteBuilder."""
+        workers = min(self.jobs or os.cpu_count() or 1, len(items))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self.include_drafts, self.config, self.all_posts)
+        ) as executor:
+            # Consume the iterator so worker exceptions surface here
+            for _ in executor.map(task_fn, items, chunksize=16):
+                pass
+
     def _prepare_output_directory(self):
-        if self.output_dir.exists():
-            shutil.rmtree(self.output_dir)
-        self.output_dir.mkdir(parents=True)
+        # build() has already cleaned; just make sure the root exists
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def _copy_static_assets(self):
         # Copy root files
@@ -249,73 +677,146 @@ class SiteBuilder:
         static_src = Path('static')
         if static_src.exists():
             static_dst = self.output_dir / 'static'
-            # Custom copy to allow processing
-            if static_dst.exists():
+            # Custom copy to allow processing. Incremental builds keep the
+            # existing tree so the image cache below can skip unchanged work.
+            if static_dst.exists() and not self.incremental:
                  shutil.rmtree(static_dst)
-            static_dst.mkdir(parents=True)
+            static_dst.mkdir(parents=True, exist_ok=True)
 
-            for root, dirs, files in os.walk(static_src):
-                # Calculate relative path
-                rel_path = Path(root).relative_to(static_src)
-                target_dir = static_dst / rel_path
-                target_dir.mkdir(parents=True, exist_ok=True)
-                
-                for file in files:
-                    src_file = Path(root) / file
-                    dst_file = target_dir / file
-                    
-                    if file.endswith('.css'):
-                        with open(src_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        minified = rcssmin.cssmin(content)
-                        with open(dst_file, 'w', encoding='utf-8') as f:
-                            f.write(minified)
-                    elif file.endswith('.scss'):
-                        # Skip partials
-                        if file.startswith('_'):
-                            continue
-                            
-                        try:
-                            # Compile Sass with minification
-                            compiled_css = sass.compile(filename=str(src_file), output_style='compressed')
-                            
-                            # Save as .css
-                            css_dst = dst_file.with_suffix('.css')
-                            with open(css_dst, 'w', encoding='utf-8') as f:
-                                f.write(compiled_css)
-                        except Exception as e:
-                            print(f"Error compiling Sass {src_file}: {e}")
-
-                    elif file.endswith('.js'):
-                        # rjsmin doesn't handle some modern JS features carefully, 
-                        # but site_builder.py is python. rjsmin is python binding.
-                        # Basic JS minification.
-                        with open(src_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        minified = rjsmin.jsmin(content)
-                        with open(dst_file, 'w', encoding='utf-8') as f:
-                            f.write(minified)
-                    elif file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                        # Image Optimization
-                        try:
-                            with Image.open(src_file) as img:
-                                # Resize if larger than 1200px
-                                if img.width > 1200:
-                                    ratio = 1200 / img.width
-                                    new_height = int(img.height * ratio)
-                                    img = img.resize((1200, new_height), Image.Resampling.LANCZOS)
-                                
-                                # Save optimized original
-                                img.save(dst_file, optimize=True, quality=85)
-                                
-                                # Generate WebP
-                                webp_path = dst_file.with_suffix('.webp')
-                                img.save(webp_path, 'WEBP', quality=85)
-                        except Exception as e:
-                            print(f"Error optimizing image {src_file}: {e}")
-                            shutil.copy2(src_file, dst_file)
-                    else:
-                        shutil.copy2(src_file, dst_file)
+            # Image cache: src path -> src mtime at last encode. A hit
+            # (with both outputs still on disk) skips the decode/re-encode
+            # entirely on warm builds.
+            image_cache_file = Path('.cache/image_cache.json')
+            try:
+                image_cache = _json_loads(image_cache_file.read_bytes())
+            except Exception:
+                image_cache = {}
+            new_image_cache = {}
+
+            # Plain copies are handled inline during the walk; CPU-heavy
+            # image and Sass work is collected into batches and spread
+            # over a process pool below, and css/js minification is
+            # batched so esbuild can do it in a single invocation.
+            image_jobs = []
+            scss_jobs = []
+            minify_jobs = []
+            created_dirs = {static_dst}
+            for entry in _scandir_files(str(static_src)):
+                file = entry.name
+                src_file = Path(entry.path)
+                dst_file = static_dst / src_file.relative_to(static_src)
+
+                target_dir = dst_file.parent
+                if target_dir not in created_dirs:
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(target_dir)
+
+                if file.endswith(('.css', '.js')):
+                    minify_jobs.append((src_file, dst_file))
+                elif file.endswith('.scss'):
+                    # Skip partials
+                    if file.startswith('_'):
+                        continue
+                    scss_jobs.append((src_file, dst_file.with_suffix('.css')))
+                elif file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                    src_key = str(src_file)
+                    src_mtime = entry.stat().st_mtime
+                    new_image_cache[src_key] = src_mtime
+                    if (image_cache.get(src_key) == src_mtime
+                            and dst_file.exists()
+                            and dst_file.with_suffix('.webp').exists()):
+                        continue
+                    image_jobs.append((src_file, dst_file))
+                else:
+                    # copyfile takes the in-kernel sendfile path and skips
+                    # the copystat metadata round-trip copy2 would do
+                    shutil.copyfile(entry.path, dst_file)
+
+            self._minify_assets(minify_jobs, static_src, static_dst)
+            self._run_asset_jobs(_optimize_image_worker, image_jobs)
+            self._compile_scss(scss_jobs, static_src, static_dst)
+
+            try:
+                image_cache_file.parent.mkdir(parents=True, exist_ok=True)
+                image_cache_file.write_bytes(_json_dumps(new_image_cache))
+            except Exception as e:
+                print(f"Warning: Failed to save image cache: {e}")
+
+    def _minify_assets(self, jobs, static_src, static_dst):
+        """Minify collected css/js files, in one esbuild call if available.
+
+        esbuild handles hundreds of files in a single Go-native
+        invocation; without it on PATH the pure-Python rcssmin/rjsmin
+        minifiers run per file as before.
+        """
+        if not jobs:
+            return
+
+        esbuild = shutil.which('esbuild')
+        if esbuild:
+            import subprocess
+            try:
+                result = subprocess.run(
+                    [esbuild, '--minify', f'--outdir={static_dst}',
+                     f'--outbase={static_src}',
+                     *(str(src) for src, _ in jobs)],
+                    capture_output=True, text=True)
+                if result.returncode == 0:
+                    return
+                print(f"Warning: esbuild failed ({result.stderr.strip()}), "
+                      "falling back to rcssmin/rjsmin.")
+            except Exception as e:
+                print(f"Warning: esbuild invocation failed ({e}), "
+                      "falling back to rcssmin/rjsmin.")
+
+        for src_file, dst_file in jobs:
+            with open(src_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if src_file.suffix == '.css':
+                minified = rcssmin.cssmin(content)
+            else:
+                # rjsmin doesn't handle some modern JS features carefully,
+                # but site_builder.py is python. rjsmin is python binding.
+                # Basic JS minification.
+                minified = rjsmin.jsmin(content)
+            with open(dst_file, 'w', encoding='utf-8') as f:
+                f.write(minified)
+
+    def _compile_scss(self, jobs, static_src, static_dst):
+        """Compile Sass entry points, preferring one whole-tree compile.
+
+        libsass's dirname mode compiles every non-partial .scss under the
+        source tree in a single call, paying import resolution and AST
+        setup once instead of per entry point. If the batch compile
+        fails, the per-file worker path runs so one broken stylesheet
+        doesn't take down the rest.
+        """
+        if not jobs:
+            return
+        try:
+            sass.compile(dirname=(str(static_src), str(static_dst)),
+                         output_style='compressed')
+            return
+        except Exception as e:
+            print(f"Warning: Batch Sass compile failed ({e}), "
+                  "falling back to per-file compiles.")
+        self._run_asset_jobs(_compile_scss_worker, jobs)
+
+    def _run_asset_jobs(self, worker, jobs):
+        """Run asset jobs on a process pool, or serially for small batches."""
+        if not jobs:
+            return
+        if self.jobs != 1 and len(jobs) >= _MIN_PARALLEL_ASSETS:
+            try:
+                workers = min(self.jobs or os.cpu_count() or 1, len(jobs))
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for _ in executor.map(worker, jobs, chunksize=4):
+                        pass
+                return
+            except Exception as e:
+                print(f"Warning: Parallel asset processing failed ({e}), falling back to serial.")
+        for job in jobs:
+            worker(job)
 
     def _copy_content_assets(self):
         """Copy non-markdown files from content directory to output directory."""
@@ -323,24 +824,27 @@ class SiteBuilder:
         if not content_path.exists():
             return
 
-        for root, _, files in os.walk(content_path):
-            for file in files:
-                if file.endswith('.md'):
-                    continue
-                
-                src_path = Path(root) / file
-                rel_path = src_path.relative_to(content_path)
-                
-                # Localize the first part of the path (section) if applicable
-                parts = list(rel_path.parts)
-                if parts and parts[0] in self.slugs:
-                    parts[0] = self.slugs[parts[0]]
-                    rel_path = Path(*parts)
-                
-                dst_path = self.output_dir / rel_path
-                
+        created_dirs = set()
+        for entry in _scandir_files(str(content_path)):
+            if entry.name.endswith('.md'):
+                continue
+
+            src_path = Path(entry.path)
+            rel_path = src_path.relative_to(content_path)
+
+            # Localize the first part of the path (section) if applicable
+            parts = list(rel_path.parts)
+            if parts and parts[0] in self.slugs:
+                parts[0] = self.slugs[parts[0]]
+                rel_path = Path(*parts)
+
+            dst_path = self.output_dir / rel_path
+
+            # One mkdir per unique directory, not per file
+            if dst_path.parent not in created_dirs:
                 dst_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src_path, dst_path)
+                created_dirs.add(dst_path.parent)
+            shutil.copyfile(entry.path, dst_path)
 
     def _render_post(self, post: ContentItem):
         # Create directory: {output_dir}/{section}/{slug}/
@@ -348,8 +852,7 @@ class SiteBuilder:
         # So we strip leading slash
         rel_path = post.url.strip('/')
         post_dir = self.output_dir / rel_path
-        post_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Determine template
         # Check frontmatter for explicit template
         if post.frontmatter.get('template'):
@@ -357,7 +860,7 @@ class SiteBuilder:
         else:
             # Try to find {type}.html, else fall back to post.html
             template_name = f"{post.type}.html"
-            if not os.path.exists(f"templates/{template_name}"):
+            if template_name not in self._available_templates:
                  template_name = 'post.html'
         
         # Get related posts
@@ -371,8 +874,7 @@ class SiteBuilder:
             'related_posts': related_posts
         }, current_url=post.url)
         
-        with open(post_dir / 'index.html', 'w', encoding='utf-8') as f:
-            f.write(html)
+        self._write_output(post_dir / 'index.html', html)
 
     def _render_index(self, posts: List[ContentItem]):
         # Pagination Logic
@@ -437,7 +939,6 @@ class SiteBuilder:
                 canonical_url = f"{self.config.base_url}/"
             else:
                 page_dir = self.output_dir / 'page' / str(page_num)
-                page_dir.mkdir(parents=True, exist_ok=True)
                 output_path = page_dir / 'index.html'
                 current_url = f'/page/{page_num}/'
                 canonical_url = f"{self.config.base_url}/page/{page_num}/"
@@ -451,8 +952,7 @@ class SiteBuilder:
                 'is_home': page_num == 1
             }, current_url=current_url)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            self._write_output(output_path, html)
 
     def _render_sections(self, posts: List[ContentItem]):
         # Group by type
@@ -468,8 +968,7 @@ class SiteBuilder:
             url_section = slugs.get(section_name, section_name)
 
             section_dir = self.output_dir / url_section
-            section_dir.mkdir(parents=True, exist_ok=True)
-            
+
             current_url = f"/{url_section}/"
 
             # Translate Title
@@ -485,46 +984,43 @@ class SiteBuilder:
                 'canonical_url': f"{self.config.base_url}{current_url}"
             }, current_url=current_url)
             
-            with open(section_dir / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(html)
+            self._write_output(section_dir / 'index.html', html)
 
     def _render_tags(self, posts: List[ContentItem]):
-        # Collect tags
-        tags = {}
-        for post in posts:
-            for tag in post.tags:
-                if tag not in tags:
-                    tags[tag] = []
-                tags[tag].append(post)
-        
-        # Render individual tag pages
-        tags_dir = self.output_dir / 'tags'
-        tags_dir.mkdir(exist_ok=True)
-        
-        for tag, tag_posts in tags.items():
-            tag_slug_dir = tags_dir / tag
-            tag_slug_dir.mkdir(exist_ok=True)
-            
-            current_url = f"/tags/{tag}/"
-            
-            # Localized Title
-            tag_label = self.locale_data.get('strings', {}).get('tags', 'Tag')
-            page_title = f"{tag_label}: {tag}"
-            
-            html = self._render_template('taxonomy.html', {
-                'site': self.config,
-                'posts': tag_posts,
-                'title': page_title,
-                'taxonomy_type': 'Tag',
-                'taxonomy_name': tag,
-                'canonical_url': f"{self.config.base_url}{current_url}"
-            }, current_url=current_url)
-            
-            with open(tag_slug_dir / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(html)
-                
-        # Optional: Render tag list page
-        
+        # Render individual tag pages from the precomputed index; large
+        # taxonomies go through the same worker pool as posts
+        if self.jobs != 1 and len(self.tag_index) >= _MIN_PARALLEL_RENDER:
+            try:
+                self._render_parallel(_render_tag_task, list(self.tag_index))
+                for tag in self.tag_index:
+                    self._outputs.add(f'tags/{tag}/index.html')
+                return
+            except Exception as e:
+                print(f"Warning: Parallel tag rendering failed ({e}), falling back to serial.")
+
+        for tag, tag_posts in self.tag_index.items():
+            self._render_tag_page(tag, tag_posts)
+
+    def _render_tag_page(self, tag: str, tag_posts: List[ContentItem]):
+        tag_slug_dir = self.output_dir / 'tags' / tag
+
+        current_url = f"/tags/{tag}/"
+
+        # Localized Title
+        tag_label = self.locale_data.get('strings', {}).get('tags', 'Tag')
+        page_title = f"{tag_label}: {tag}"
+
+        html = self._render_template('taxonomy.html', {
+            'site': self.config,
+            'posts': tag_posts,
+            'title': page_title,
+            'taxonomy_type': 'Tag',
+            'taxonomy_name': tag,
+            'canonical_url': f"{self.config.base_url}{current_url}"
+        }, current_url=current_url)
+
+        self._write_output(tag_slug_dir / 'index.html', html)
+
     def _render_tag_index(self, posts: List[ContentItem]):
         """Renders the comprehensive tag index page at /index."""
         # Collect tags and their posts
@@ -560,8 +1056,7 @@ class SiteBuilder:
         sorted_tags = sorted(tags.items()) # List of (tag, posts)
         
         index_dir = self.output_dir / 'index'
-        index_dir.mkdir(exist_ok=True)
-        
+
         current_url = "/index/"
         
         html = self._render_template('tag_index.html', {
@@ -571,46 +1066,46 @@ class SiteBuilder:
             'canonical_url': f"{self.config.base_url}/index/"
         }, current_url=current_url)
         
-        with open(index_dir / 'index.html', 'w', encoding='utf-8') as f:
-            f.write(html)
+        self._write_output(index_dir / 'index.html', html)
 
     def _render_categories(self, posts: List[ContentItem]):
-        # Collect categories
-        categories = {}
-        for post in posts:
-            if post.category:
-                cat = post.category
-                if cat not in categories:
-                    categories[cat] = []
-                categories[cat].append(post)
-        
-        cat_dir = self.output_dir / 'categories'
-        cat_dir.mkdir(exist_ok=True)
-        
-        for cat, cat_posts in categories.items():
-            # simple slugify
-            cat_slug = cat.lower().replace(' ', '-')
-            
-            cat_slug_dir = cat_dir / cat_slug
-            cat_slug_dir.mkdir(exist_ok=True)
-            
-            current_url = f"/categories/{cat_slug}/"
-            
-            # Localized Title
-            cat_label = self.locale_data.get('strings', {}).get('categories', 'Category')
-            page_title = f"{cat_label}: {cat}"
+        # Render category pages from the precomputed index; large
+        # taxonomies go through the same worker pool as posts
+        if self.jobs != 1 and len(self.cat_index) >= _MIN_PARALLEL_RENDER:
+            try:
+                self._render_parallel(_render_category_task, list(self.cat_index))
+                for cat in self.cat_index:
+                    cat_slug = cat.lower().replace(' ', '-')
+                    self._outputs.add(f'categories/{cat_slug}/index.html')
+                return
+            except Exception as e:
+                print(f"Warning: Parallel category rendering failed ({e}), falling back to serial.")
 
-            html = self._render_template('taxonomy.html', {
-                'site': self.config,
-                'posts': cat_posts,
-                'title': page_title,
-                'taxonomy_type': 'Category',
-                'taxonomy_name': cat,
-                'canonical_url': f"{self.config.base_url}{current_url}"
-            }, current_url=current_url)
-            
-            with open(cat_slug_dir / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(html)
+        for cat, cat_posts in self.cat_index.items():
+            self._render_category_page(cat, cat_posts)
+
+    def _render_category_page(self, cat: str, cat_posts: List[ContentItem]):
+        # simple slugify
+        cat_slug = cat.lower().replace(' ', '-')
+
+        cat_slug_dir = self.output_dir / 'categories' / cat_slug
+
+        current_url = f"/categories/{cat_slug}/"
+
+        # Localized Title
+        cat_label = self.locale_data.get('strings', {}).get('categories', 'Category')
+        page_title = f"{cat_label}: {cat}"
+
+        html = self._render_template('taxonomy.html', {
+            'site': self.config,
+            'posts': cat_posts,
+            'title': page_title,
+            'taxonomy_type': 'Category',
+            'taxonomy_name': cat,
+            'canonical_url': f"{self.config.base_url}{current_url}"
+        }, current_url=current_url)
+
+        self._write_output(cat_slug_dir / 'index.html', html)
 
     def _generate_rss(self, posts: List[ContentItem]):
         from datetime import datetime
@@ -626,8 +1121,7 @@ class SiteBuilder:
             'now': datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
         })
         
-        with open(self.output_dir / 'rss.xml', 'w', encoding='utf-8') as f:
-            f.write(rss_content)
+        self._write_output(self.output_dir / 'rss.xml', rss_content)
 
     def _generate_sitemap(self, posts: List[ContentItem]):
         # Sitemap links must be absolute
@@ -636,8 +1130,7 @@ class SiteBuilder:
             'posts': posts
         })
         
-        with open(self.output_dir / 'sitemap.xml', 'w', encoding='utf-8') as f:
-            f.write(sitemap_content)
+        self._write_output(self.output_dir / 'sitemap.xml', sitemap_content)
 
 
     def _generate_404(self):
@@ -650,17 +1143,15 @@ class SiteBuilder:
             'canonical_url': f"{self.config.base_url}/404.html"
         }, current_url=current_url)
         
-        with open(self.output_dir / '404.html', 'w', encoding='utf-8') as f:
-            f.write(html)
+        self._write_output(self.output_dir / '404.html', html)
 
     def _generate_search_index(self, posts: List[ContentItem]):
         """Generate a JSON index for client-side search."""
         search_index = []
         for post in posts:
             # Strip HTML for plain text content
-            soup = BeautifulSoup(post.content, 'html.parser')
-            text_content = soup.get_text(separator=' ', strip=True)
-            
+            text_content = _strip_tags(post.content)
+
             search_index.append({
                 'title': post.title,
                 'url': post.url,
@@ -670,14 +1161,13 @@ class SiteBuilder:
                 'type': post.type
             })
             
-        with open(self.output_dir / 'search.json', 'w', encoding='utf-8') as f:
-            json.dump(search_index, f, ensure_ascii=False)
+        self._write_output(self.output_dir / 'search.json',
+                           _json_dumps(search_index).decode('utf-8'))
 
     def _generate_search_page(self):
         """Render the static search page."""
         search_dir = self.output_dir / 'search'
-        search_dir.mkdir(parents=True, exist_ok=True)
-        
+
         current_url = "/search/"
         html = self._render_template('search.html', {
             'site': self.config,
@@ -685,61 +1175,69 @@ class SiteBuilder:
             'canonical_url': f"{self.config.base_url}/search/"
         }, current_url=current_url)
         
-        with open(search_dir / 'index.html', 'w', encoding='utf-8') as f:
-            f.write(html)
+        self._write_output(search_dir / 'index.html', html)
 
     def _get_related_posts(self, current_post: ContentItem, limit: int = 3) -> List[ContentItem]:
-        if not hasattr(self, 'all_posts') or not current_post.tags:
-            return []
-        
-        candidates = []
-        current_tags = set(current_post.tags)
-        
-        for post in self.all_posts:
-            if post == current_post:
-                continue
-            
-            # Calculate overlap
-            post_tags = set(post.tags)
-            overlap = len(current_tags.intersection(post_tags))
-            
-            if overlap > 0:
-                candidates.append((overlap, post))
-        
-        # Sort by overlap (desc), then date (desc)
-        candidates.sort(key=lambda x: (x[0], x[1].date), reverse=True)
-        
-        return [c[1] for c in candidates[:limit]]
+        """Posts sharing the most tags with current_post (ties broken by date).
 
-    def _get_relative_path(self, from_url: str, to_url: str) -> str:
+        Walks the inverted tag index, so only posts that actually share a
+        tag are visited — instead of scanning the whole corpus per post.
         """
-        Calculate relative path from current URL to target URL.
-        Useful for fully portable static sites (subfolder deployment).
+        tag_index = getattr(self, 'tag_index', None)
+        if tag_index is None or not current_post.tags:
+            return []
+
+        # ContentItem isn't hashable, so overlap counts key on id(post)
+        overlap = {}
+        by_id = {}
+        for tag in current_post.tags:
+            for post in tag_index.get(tag, ()):
+                # Compare by URL, not identity: in pool workers the
+                # current post is a pickled copy of the indexed one
+                if post.url == current_post.url:
+                    continue
+                pid = id(post)
+                overlap[pid] = overlap.get(pid, 0) + 1
+                by_id[pid] = post
+
+        top = heapq.nlargest(limit, overlap.items(),
+                             key=lambda kv: (kv[1], by_id[kv[0]].date))
+        return [by_id[pid] for pid, _ in top]
+
+    def _nav_fragment(self, current_url: str, rel_url, is_home: bool) -> str:
+        """Nav HTML for a page, rendered once per (directory depth, is_home).
+
+        All nav targets are absolute, so a '../' prefix per depth level
+        resolves them from any page at that depth — pages at the same
+        depth can share the exact same fragment.
         """
-        # Ensure URLs start with / for logic consistency
-        if not from_url.startswith('/'): from_url = '/' + from_url
-        if not to_url.startswith('/'): to_url = '/' + to_url
-
-        # Remove file name from from_url to get source directory
-        # If from_url ends with /, it is a directory.
-        # If it doesn't (like /index.html or /404.html), we need dirname.
-        if from_url.endswith('/'):
-            from_dir = from_url
+        if current_url.endswith('/'):
+            from_dir = current_url
         else:
-            from_dir = os.path.dirname(from_url)
+            from_dir = os.path.dirname(current_url)
+        depth = from_dir.strip('/').count('/') + 1 if from_dir.strip('/') else 0
 
-        # Remove leading slash for os.path.relpath to work
-        from_dir = from_dir.lstrip('/') or '.'
-        to_url = to_url.lstrip('/') or '.'
+        key = (depth, is_home)
+        fragment = self._nav_cache.get(key)
+        if fragment is None:
+            prefix = '../' * depth
 
-        try:
-            rel_path = os.path.relpath(to_url, from_dir)
-            # Preserve trailing slash if original had it and rel_path doesn't
-            if to_url.endswith('/') and not rel_path.endswith('/'):
-                 rel_path += '/'
-            return rel_path
-        except ValueError:
-            return to_url
+            def depth_rel_url(target):
+                if '://' in target or target.startswith('#') or target.startswith('mailto:'):
+                    return target
+                return prefix + target.lstrip('/') or '.'
+
+            fragment = self.renderer.render('partials/nav.html', {
+                'site': self.config,
+                'rel_url': depth_rel_url,
+                'is_home': is_home
+            })
+            self._nav_cache[key] = fragment
+        return fragment
+
+    def _get_relative_path(self, from_url: str, to_url: str) -> str:
+        """Relative path from current URL to target URL (memoized)."""
+        return _relpath_cached(from_url, to_url)
 
     def _render_template(self, template_name: str, context: Dict[str, Any], current_url: str = None) -> str:
         # Inject rel_url helper
@@ -751,65 +1249,63 @@ class SiteBuilder:
                 return self._get_relative_path(current_url, target)
             
             context['rel_url'] = rel_url
-        
+            context['nav_html'] = self._nav_fragment(current_url, rel_url,
+                                                     bool(context.get('is_home')))
+
         html = self.renderer.render(template_name, context)
-        html = self._resolve_internal_links(html, current_url)
-        return self._process_links(html)
+        return self._rewrite_links(html, current_url)
+
+    def _rewrite_links(self, html: str, current_url: str = None) -> str:
+        """Resolve internal-link tags and tag outbound links, in one parse.
+
+        Both rewrites used to be separate methods, each paying a full
+        BeautifulSoup parse and serialization per page; they now share a
+        single DOM pass. Pages that need neither skip the parse entirely.
+        """
+        has_internal = '<internal-link' in html
+        # Only external links get rewritten; pages without any absolute
+        # URL skip that pass
+        has_external = bool(self.config.base_url) and 'http' in html
 
-    def _process_links(self, html: str) -> str:
-        if not self.config.base_url:
+        if not has_internal and not has_external:
             return html
-            
-        soup = BeautifulSoup(html, 'html.parser')
+
+        soup = BeautifulSoup(html, _BS_PARSER)
+
+        if has_internal:
+            self._resolve_internal_links_in(soup, current_url)
+        if has_external:
+            self._process_links_in(soup)
+
+        return str(soup)
+
+    def _process_links_in(self, soup):
         base_netloc = urlparse(self.config.base_url).netloc
-        
+
         for a_tag in soup.find_all('a', href=True):
             href = a_tag['href']
+            # Cheap string checks replace the urlparse/urlencode/urlunparse
+            # round-trip that used to run for every link on every page
+            if not href.startswith(('http://', 'https://')):
+                continue
             try:
-                parsed = urlparse(href)
-                # Check if absolute URL and different domain
-                if parsed.scheme and parsed.netloc and parsed.netloc != base_netloc:
-                    if parsed.fragment:
-                        # Append ref to fragment
-                        # Check if fragment already has query params logic (contains ?)
-                        sep = '&' if '?' in parsed.fragment else '?'
-                        new_fragment = f"{parsed.fragment}{sep}ref={base_netloc}"
-                        new_href = urlunparse((
-                            parsed.scheme,
-                            parsed.netloc,
-                            parsed.path,
-                            parsed.params,
-                            parsed.query,
-                            new_fragment
-                        ))
-                    else:
-                        # Add ref param to query (standard)
-                        query_params['ref'] = [base_netloc]
-                        
-                        # Reconstruct URL
-                        new_query = urlencode(query_params, doseq=True)
-                        new_href = urlunparse((
-                            parsed.scheme,
-                            parsed.netloc,
-                            parsed.path,
-                            parsed.params,
-                            new_query,
-                            parsed.fragment
-                        ))
-                    
-                    a_tag['href'] = new_href
-            except Exception as e:
-                # Ignore malformed URLs
-                pass
-                
-        return str(soup)
+                netloc = href.split('/', 3)[2]
+            except IndexError:
+                # Malformed URL, leave it alone
+                continue
+            if not netloc or netloc == base_netloc:
+                continue
 
-    def _resolve_internal_links(self, html: str, current_url: str = None) -> str:
-        if '<internal-link' not in html:
-            return html
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
+            base, hash_sep, fragment = href.partition('#')
+            if hash_sep:
+                # Append ref to the fragment, as before
+                sep = '&' if '?' in fragment else '?'
+                a_tag['href'] = f"{base}#{fragment}{sep}ref={base_netloc}"
+            else:
+                sep = '&' if '?' in base else '?'
+                a_tag['href'] = f"{base}{sep}ref={base_netloc}"
+
+    def _resolve_internal_links_in(self, soup, current_url: str = None):
         for tag in soup.find_all('internal-link'):
             shortname = tag.get('shortname')
             target_post = self.shortname_map.get(shortname)
@@ -833,8 +1329,6 @@ class SiteBuilder:
                 new_tag.string = f"[Broken Link: {shortname}]"
                 tag.replace_with(new_tag)
                 print(f"Warning: Could not resolve internal link '{shortname}'")
-        
-        return str(soup)
 
     def _generate_humans_txt(self):
         """Generate/Override humans.txt based on config (Generic Version)."""
@@ -842,38 +1336,47 @@ class SiteBuilder:
         if not humans:
             return
 
-        lines = []
+        # Stream into a buffer instead of collecting a list and joining;
+        # deferring separators avoids the trailing-blank strip pass
+        buf = io.StringIO()
+        write = buf.write
+        sep = ''
 
         for section_name, section_data in humans.items():
             # Section Header (e.g. /* TEAM */)
-            lines.append(f"/* {section_name.upper()} */")
-            
+            write(sep)
+            write(f"/* {section_name.upper()} */")
+            sep = '\n'
+
             # Handle List of items (e.g. Team members, Thanks list)
             if isinstance(section_data, list):
                 for item in section_data:
                     if isinstance(item, dict):
                         # List of objects (Team members)
                         for key, value in item.items():
-                            lines.append(f"{key.capitalize()}: {value}")
-                        lines.append("") # Separator between items
+                            write(sep)
+                            write(f"{key.capitalize()}: {value}")
+                            sep = '\n'
+                        sep = '\n\n' # Separator between items
                     else:
                          # Simple list (Thanks)
-                         lines.append(str(item))
+                         write(sep)
+                         write(str(item))
+                         sep = '\n'
                 if isinstance(section_data[0], str):
-                     lines.append("") # Separator after simple list
+                     sep = '\n\n' # Separator after simple list
 
             # Handle Dictionary (e.g. Site, Contact)
             elif isinstance(section_data, dict):
                 for key, value in section_data.items():
+                    write(sep)
                     # Handle list values (e.g. standards: [...])
                     if isinstance(value, list):
-                        lines.append(f"{key.capitalize()}: {', '.join(str(v) for v in value)}")
+                        write(f"{key.capitalize()}: {', '.join(str(v) for v in value)}")
                     else:
-                        lines.append(f"{key.capitalize()}: {value}")
-                lines.append("")
+                        write(f"{key.capitalize()}: {value}")
+                    sep = '\n'
+                sep = '\n\n'
 
-        content = "\n".join(lines).strip()
-        
-        with open(self.output_dir / 'humans.txt', 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_output(self.output_dir / 'humans.txt', buf.getvalue())
 
@@ -2,10 +2,9 @@
 # PYTHON_ARGCOMPLETE_OK
 import argparse
 import os
-import shutil
+import re
 import sys
 import http.server
-import socketserver
 from datetime import datetime
 from pathlib import Path
 from generator.site_builder import SiteBuilder
@@ -15,6 +14,13 @@ try:
 except ImportError:
     Server = None
 
+# Slug characters to strip when creating new posts
+_SLUG_STRIP = re.compile(r'[^a-z0-9-]')
+
+# Swedish character replacements, as a translation table: one C-level
+# pass over the slug instead of a str.replace scan per character
+_SV_TRANS = str.maketrans('åäöÅÄÖ', 'aaoaao')
+
 
 def command_build(args):
     """Build the static site."""
@@ -27,7 +33,8 @@ def command_build(args):
                 os.remove(cache_file)
                 print("Cache cleared.")
         
-        builder = SiteBuilder(include_drafts=args.drafts)
+        builder = SiteBuilder(include_drafts=args.drafts, jobs=args.jobs,
+                              incremental=args.incremental)
         builder.build()
 
         print("Build complete.")
@@ -50,25 +57,38 @@ def command_serve(args):
         # Use livereload if available
         server = Server()
         
-        # Define build function to run on changes
+        # One builder for the whole serve session: config, templates,
+        # locale and data are loaded once and the Jinja environment,
+        # markdown cache and memoized filters stay warm across rebuilds.
+        # Perform initial build to ensure state matches flags.
+        print("Performing initial build...")
+        builder = SiteBuilder(include_drafts=args.drafts)
+        builder.build()
+        builder.incremental = True
+
+        # Content-only edits reuse the warm builder on the incremental
+        # path (skip unchanged pages); template, config, data or
+        # generator changes start a fresh builder and do a full build.
         def rebuild():
             print("Detected change, rebuilding...")
-            builder = SiteBuilder(include_drafts=args.drafts) 
             builder.build()
             print("Rebuild complete.")
 
-        # Perform initial build to ensure state matches flags
-        print("Performing initial build...")
-        initial_builder = SiteBuilder(include_drafts=args.drafts)
-        initial_builder.build()
+        def rebuild_full():
+            nonlocal builder
+            print("Detected change, rebuilding...")
+            builder = SiteBuilder(include_drafts=args.drafts)
+            builder.build()
+            builder.incremental = True
+            print("Rebuild complete.")
 
         # Watch patterns
         server.watch('content/', rebuild)
-        server.watch('templates/', rebuild)
+        server.watch('templates/', rebuild_full)
         server.watch('static/', rebuild)
-        server.watch('generator/', rebuild)
-        server.watch('data/', rebuild)
-        server.watch('config.yaml', rebuild)
+        server.watch('generator/', rebuild_full)
+        server.watch('data/', rebuild_full)
+        server.watch('config.yaml', rebuild_full)
         server.watch('files/', rebuild)
         
         print(f"Serving '{directory}' with Live Reload at http://localhost:{port}")
@@ -82,8 +102,12 @@ def command_serve(args):
             def __init__(self, *args, **kwargs):
                 super().__init__(*args, directory=directory, **kwargs)
 
+        # Threaded server: pages with many assets would otherwise stall
+        # on single-threaded request handling. ThreadingHTTPServer uses
+        # daemon threads and allow_reuse_address out of the box, so
+        # Ctrl+C exits cleanly and quick restarts avoid EADDRINUSE.
         try:
-            with socketserver.TCPServer(("", port), Handler) as httpd:
+            with http.server.ThreadingHTTPServer(("", port), Handler) as httpd:
                 print(f"Serving '{directory}' at http://localhost:{port}")
                 print("Press Ctrl+C to stop.")
                 httpd.serve_forever()
@@ -98,26 +122,15 @@ def command_new(args):
     title = args.title
     post_type = args.type
     
-    slug = title.lower()
-    
-    # Swedish character replacements
-    replacements = {
-        'å': 'a',
-        'ä': 'a',
-        'ö': 'o',
-        'Å': 'a',
-        'Ä': 'a',
-        'Ö': 'o'
-    }
-    for char, replacement in replacements.items():
-        slug = slug.replace(char, replacement)
-        
+    slug = title.lower().translate(_SV_TRANS)
+
     slug = slug.replace(" ", "-") # Simple slugify
-    import re
-    slug = re.sub(r'[^a-z0-9-]', '', slug)
+    slug = _SLUG_STRIP.sub('', slug)
     
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    datetime_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+    # One now() call: both strings are guaranteed the same instant
+    now = datetime.now()
+    date_str = now.strftime("%Y-%m-%d")
+    datetime_str = now.strftime("%Y-%m-%d %H:%M")
     
     # Determine directory and filename structure
     if post_type == 'micro':
@@ -190,14 +203,34 @@ def command_new(args):
         print(f"Error creating post: {e}")
         sys.exit(1)
 
+def _fast_rmtree(path):
+    """Remove a directory tree iteratively with os.scandir.
+
+    Skips shutil.rmtree's per-entry error handling and extra lstat
+    calls; each directory is removed once its children are gone.
+    """
+    stack = [(path, False)]
+    while stack:
+        top, visited = stack.pop()
+        if visited:
+            os.rmdir(top)
+            continue
+        stack.append((top, True))
+        with os.scandir(top) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                else:
+                    os.unlink(entry.path)
+
 def command_clean(args):
     """Clean the output directory."""
     config = load_config('config.yaml')
     directory = config.output_dir
-    
+
     if os.path.exists(directory):
         try:
-            shutil.rmtree(directory)
+            _fast_rmtree(directory)
             print(f"Removed '{directory}' directory.")
         except Exception as e:
             print(f"Error cleaning directory: {e}")
@@ -213,6 +246,8 @@ def main():
     parser_build = subparsers.add_parser("build", help="Build the static site")
     parser_build.add_argument("--drafts", action="store_true", help="Include draft posts")
     parser_build.add_argument("--no-cache", action="store_true", help="Ignore cache and force full rebuild")
+    parser_build.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes for rendering (default: CPU count, 1 = serial)")
+    parser_build.add_argument("--incremental", action="store_true", help="Keep existing output and only re-render changed posts")
     
     # Serve command
 
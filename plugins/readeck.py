@@ -1,20 +1,53 @@
 
 import argparse
+import heapq
 import requests
 import re
 import os
 import json
 from datetime import datetime
 from pathlib import Path
-import cloudscraper
+
+# orjson reads/writes the data file several times faster than stdlib
+# json; large archives carry full excerpt bodies per article
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+
+# One session for the whole run: pagination then reuses the pooled
+# connection instead of paying a TCP+TLS handshake per page. Created
+# lazily so plugin loading stays cheap for unrelated commands.
+_SCRAPER = None
+
+def _get_scraper():
+    global _SCRAPER
+    if _SCRAPER is None:
+        import cloudscraper
+        _SCRAPER = cloudscraper.create_scraper()
+    return _SCRAPER
 
 def register_commands(subparsers):
     parser = subparsers.add_parser("import-readeck", help="Import articles from Readeck API")
     parser.add_argument("--url", required=True, help="Readeck Instance URL")
     parser.add_argument("--token", required=True, help="API Token")
-    parser.add_argument("--limit", type=int, default=100, help="Limit number of articles to fetch")
+    parser.add_argument("--limit", type=int, default=100, help="Page size per API request (all pages are fetched)")
     parser.set_defaults(func=command_import_readeck)
 
+def _write_if_changed(path, data: bytes) -> bool:
+    """Write data to path unless identical bytes are already there.
+
+    Keeps the file's mtime stable on no-op imports, so watchers and
+    incremental builds don't see a phantom change.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
 def command_import_readeck(args):
     print(f"Fetching articles from {args.url}...")
     
@@ -23,8 +56,8 @@ def command_import_readeck(args):
     existing_data = []
     if data_file.exists():
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
+            raw = data_file.read_bytes()
+            existing_data = _json_fast.loads(raw) if _json_fast else json.loads(raw)
         except Exception as e:
             print(f"Warning: Could not read existing data: {e}")
 
@@ -42,76 +75,111 @@ def command_import_readeck(args):
     
     headers = {
         "Authorization": f"Bearer {args.token}",
-        "Accept": "application/json"
+        "Accept": "application/json",
+        # requests sends this by default, but be explicit about it
+        "Accept-Encoding": "gzip"
     }
 
-    scraper = cloudscraper.create_scraper()
-    
-    try:
-        response = scraper.get(api_url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error Code: {response.status_code}")
-            print(f"Response Body: {response.text}")
-            response.raise_for_status()
-            
-        try:
-            data = response.json()
-        except Exception as e:
-            print(f"Failed to decode JSON. Status: {response.status_code}")
-            print(f"Response Content: {response.text}")
-            raise e
-        
-        if isinstance(data, list):
-            results = data
-        else:
-            results = data.get('results', []) or data.get('data', [])
+    scraper = _get_scraper()
 
-        print(f"Found {len(results)} articles.")
-        
+    try:
+        # Fetch page by page over the shared session until the server
+        # returns a short page; --limit is the page size
+        found = 0
         count = 0
-        for item in results:
-            url = item.get('url')
-            if not url: continue
-
-            title = item.get('title') or "Untitled"
-            desc = item.get('excerpt', '') or item.get('description', '')
-            
-            # Date handling
-            # Field is 'created' based on debug output
-            date_str = item.get('created', '')
-            # Ensure we have a valid ISOish string
-            if not date_str:
-                date_str = datetime.now().isoformat()
-            
-            # Standardize date to YYYY-MM-DD for grouping
-            display_date = date_str[:10]
-            
-            new_entry = {
-                "title": title,
-                "url": url,
-                "description": desc,
-                "date": display_date,
-                "tags": item.get('labels', []) # debug showed 'labels'
-            }
-            
-            # Update or Add
-            if url not in data_map:
-                count += 1
-            
-            data_map[url] = new_entry
-            
-        # Convert back to list and sort
-        final_list = list(data_map.values())
-        final_list.sort(key=lambda x: x['date'], reverse=True)
+        offset = 0
+        new_entries = []
+        # The file is written newest-first, so a merge of the existing
+        # list with the (sorted) new entries replaces the full re-sort;
+        # a changed date on an updated entry forces the sort fallback
+        needs_sort = not all(a['date'] >= b['date']
+                             for a, b in zip(existing_data, existing_data[1:]))
+        while True:
+            response = scraper.get(api_url, headers=headers,
+                                   params=dict(params, offset=offset))
+
+            if response.status_code != 200:
+                print(f"Error Code: {response.status_code}")
+                print(f"Response Body: {response.text}")
+                response.raise_for_status()
+
+            try:
+                data = response.json()
+            except Exception as e:
+                print(f"Failed to decode JSON. Status: {response.status_code}")
+                print(f"Response Content: {response.text}")
+                raise e
+
+            if isinstance(data, list):
+                results = data
+            else:
+                results = data.get('results', []) or data.get('data', [])
+
+            for item in results:
+                url = item.get('url')
+                if not url: continue
+
+                title = item.get('title') or "Untitled"
+                desc = item.get('excerpt', '') or item.get('description', '')
+
+                # Date handling
+                # Field is 'created' based on debug output
+                date_str = item.get('created', '')
+                # Ensure we have a valid ISOish string
+                if not date_str:
+                    date_str = datetime.now().isoformat()
+
+                # Standardize date to YYYY-MM-DD for grouping
+                display_date = date_str[:10]
+
+                new_entry = {
+                    "title": title,
+                    "url": url,
+                    "description": desc,
+                    "date": display_date,
+                    "tags": item.get('labels', []) # debug showed 'labels'
+                }
+
+                # Update in place or collect as new; keeping the two
+                # groups apart lets the merge below skip a full re-sort
+                existing_entry = data_map.get(url)
+                if existing_entry is None:
+                    count += 1
+                    data_map[url] = new_entry
+                    new_entries.append(new_entry)
+                else:
+                    if existing_entry['date'] != new_entry['date']:
+                        needs_sort = True
+                    existing_entry.update(new_entry)
+
+            found += len(results)
+            if len(results) < args.limit:
+                break
+            offset += len(results)
+
+        print(f"Found {found} articles.")
+
+        # Merge the N existing + K new entries in O(N + K log K) instead
+        # of re-sorting the whole archive every run
+        if needs_sort:
+            final_list = sorted(data_map.values(),
+                                key=lambda x: x['date'], reverse=True)
+        else:
+            new_entries.sort(key=lambda x: x['date'], reverse=True)
+            final_list = list(heapq.merge(existing_data, new_entries,
+                                          key=lambda x: x['date'], reverse=True))
         
         # Ensure data dir exists
         data_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(data_file, 'w', encoding='utf-8') as f:
-            json.dump(final_list, f, indent=2, ensure_ascii=False)
-            
-        print(f"Import complete. {count} new/updated articles saved to {data_file}.")
+        if _json_fast:
+            payload = _json_fast.dumps(final_list, option=_json_fast.OPT_INDENT_2)
+        else:
+            payload = json.dumps(final_list, indent=2, ensure_ascii=False).encode('utf-8')
+        if _write_if_changed(data_file, payload):
+            print(f"Import complete. {count} new/updated articles saved to {data_file}.")
+        else:
+            print(f"Import complete. No changes for {data_file}.")
         
     except Exception as e:
         print(f"Error fetching articles: {e}")